@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -5,7 +7,36 @@ class Settings(BaseSettings):
     BASE_URL: str
     TIMEOUT: int
 
+    # Optional multi-target mode: comma-separated base URLs, each optionally
+    # named as name=url (e.g. "staging=https://a/bank,replica=https://b/bank").
+    # When set, the suite runs once per target instead of against BASE_URL.
+    BASE_URLS: str = ""
+
+    # Optional record/replay of HTTP traffic: "off", "record" or "replay"
+    CASSETTE_MODE: str = "off"
+    CASSETTE_PATH: str = "cassettes/parabank"
+    # Replay with the recorded response times (scaled) instead of instantly
+    CASSETTE_SIMULATE_LATENCY: bool = False
+    CASSETTE_LATENCY_SCALE: float = 1.0
+
     # This tells pydantic to load variables from a .env file if it exists
     model_config = SettingsConfigDict(env_file='.env', env_file_encoding='utf-8', extra='ignore')
 
-settings = Settings()
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Read and validate settings once, on first use."""
+    return Settings()
+
+
+class _LazySettings:
+    """Proxy that defers reading .env / the environment until an attribute is accessed."""
+
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+
+    def __repr__(self) -> str:
+        return repr(get_settings())
+
+
+settings = _LazySettings()
@@ -1,5 +1,8 @@
 # Automatically load plugins/fixtures
 pytest_plugins = [
     "fixtures.api_client_fixture",
-    "fixtures.services_fixtures"
+    "fixtures.services_fixtures",
+    "fixtures.positions_fixtures",
+    "plugins.scheduler",
+    "plugins.multi_target"
 ]
@@ -4,7 +4,9 @@ import time
 from typing import Dict, Any, Optional
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from core.cassette import Cassette
 from core.exceptions import APIError, APITimeoutError, APIConnectionError
+from core.metrics import LatencyRecorder
 
 logger = logging.getLogger(__name__)
 
@@ -14,10 +16,15 @@ class APIClient:
     A unified API client to interact with the backend services.
     It wraps the standard requests library with logging, default headers,
     configurable timeouts, and automatic retry logic for transient failures.
+    An optional Cassette records live traffic or replays it without network,
+    and an optional LatencyRecorder collects response times per endpoint.
     """
-    def __init__(self, base_url: str, timeout: int = 10, max_retries: int = 3):
+    def __init__(self, base_url: str, timeout: int = 10, max_retries: int = 3, cassette: Optional[Cassette] = None,
+                 latency_recorder: Optional[LatencyRecorder] = None):
         self.base_url = base_url
         self.timeout = timeout
+        self.cassette = cassette
+        self.latency_recorder = latency_recorder
         self.session = requests.Session()
 
         # Ensure we ask for JSON responses
@@ -47,6 +54,13 @@ class APIClient:
         if 'timeout' not in kwargs:
             kwargs['timeout'] = self.timeout
 
+        if self.cassette is not None and self.cassette.mode == "replay":
+            response, recorded_ms = self.cassette.play(method, url, endpoint, kwargs.get('params'))
+            logger.info(f"API Response Status: {response.status_code} (replayed, recorded {recorded_ms:.0f}ms)")
+            if self.latency_recorder is not None:
+                self.latency_recorder.record(method, endpoint, response.status_code, recorded_ms)
+            return response
+
         start_time = time.time()
 
         try:
@@ -63,6 +77,11 @@ class APIClient:
         elapsed_ms = (time.time() - start_time) * 1000
         logger.info(f"API Response Status: {response.status_code} ({elapsed_ms:.0f}ms)")
 
+        if self.latency_recorder is not None:
+            self.latency_recorder.record(method, endpoint, response.status_code, elapsed_ms)
+        if self.cassette is not None:
+            self.cassette.record(method, endpoint, kwargs.get('params'), response, elapsed_ms)
+
         try:
             logger.info(f"API Response Body: {response.json()}")
         except ValueError:
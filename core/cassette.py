@@ -0,0 +1,263 @@
+"""
+Offline record/replay of HTTP interactions for the APIClient.
+
+A cassette is two files:
+  - ``<path>.cassette``: a magic header followed by zlib-compressed records
+    (response metadata as JSON, then the raw response body), appended in
+    recording order.
+  - ``<path>.cassette.idx``: a small JSON index mapping a match key
+    (method, templated path, normalized params) to the offset, length and
+    recorded latency of every record with that key.
+
+On replay only the index is parsed; the data file is memory-mapped and a
+record is decompressed when it is first matched, so large cassettes open
+instantly.
+"""
+import json
+import logging
+import mmap
+import os
+import re
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, quote
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from core.exceptions import CassetteError, CassetteMissError
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PBCASSETTE1\n"
+INDEX_VERSION = 1
+
+# Path segments that vary between runs but not between equivalent requests
+DATE_SEGMENT = re.compile(r"^\d{1,2}-\d{1,2}-\d{4}$")
+ID_SEGMENT = re.compile(r"^\d+$")
+
+
+@dataclass(frozen=True)
+class MatchPolicy:
+    """
+    Controls which parts of a request must match a recording.
+
+    template_ids / template_dates replace numeric and MM-DD-YYYY path
+    segments with placeholders, so generated account IDs and date windows
+    match their recorded counterparts. Params listed in ``volatile_params``
+    are matched by name only. Among recordings sharing a key, an unused
+    exact path/params match is preferred, then the last exact match again,
+    then unused templated matches in recording order.
+    """
+    template_ids: bool = True
+    template_dates: bool = True
+    volatile_params: frozenset = frozenset()
+
+    def template_path(self, path: str) -> str:
+        segments = []
+        for segment in path.split("/"):
+            if self.template_dates and DATE_SEGMENT.match(segment):
+                segment = "{date}"
+            elif self.template_ids and ID_SEGMENT.match(segment):
+                segment = "{id}"
+            segments.append(segment)
+        return "/".join(segments)
+
+    def normalize_params(self, params: Optional[Dict[str, Any]]) -> str:
+        if not params:
+            return ""
+        return "&".join(
+            f"{name}=*" if name in self.volatile_params else f"{name}={quote(str(params[name]), safe='')}"
+            for name in sorted(params)
+            if params[name] is not None
+        )
+
+    def key(self, method: str, path: str, params: Optional[Dict[str, Any]]) -> str:
+        return f"{method.upper()} {self.template_path(path)}?{self.normalize_params(params)}"
+
+
+def exact_signature(method: str, path: str, params: Optional[Dict[str, Any]]) -> str:
+    """Untemplated request identity, used to prefer exact matches on replay."""
+    return MatchPolicy(False, False).key(method, path, params)
+
+
+@dataclass
+class _Entry:
+    offset: int
+    length: int
+    elapsed_ms: float
+    signature: str
+    used: bool = field(default=False, compare=False)
+
+
+class Cassette:
+    """
+    Records responses from live traffic or replays them with zero network.
+
+    mode is "record" (overwrite the cassette with live traffic) or "replay".
+    With simulate_latency, replayed responses sleep for their recorded time
+    multiplied by latency_scale.
+    """
+    MODES = ("record", "replay")
+
+    def __init__(self, path: str, mode: str = "replay", policy: Optional[MatchPolicy] = None,
+                 simulate_latency: bool = False, latency_scale: float = 1.0):
+        if mode not in self.MODES:
+            raise CassetteError(f"Unknown cassette mode '{mode}', expected one of {self.MODES}")
+        self.path = path
+        self.mode = mode
+        self.policy = policy or MatchPolicy()
+        self.simulate_latency = simulate_latency
+        self.latency_scale = latency_scale
+        self.data_path = f"{path}.cassette"
+        self.index_path = f"{path}.cassette.idx"
+        self.index: Dict[str, List[_Entry]] = {}
+        self._writer = None
+        self._offset = 0
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+
+        if mode == "record":
+            self._open_for_record()
+        else:
+            self._open_for_replay()
+
+    # -- recording --------------------------------------------------------
+
+    def _open_for_record(self) -> None:
+        directory = os.path.dirname(self.data_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._writer = open(self.data_path, "wb")
+        self._writer.write(MAGIC)
+        self._offset = len(MAGIC)
+
+    def record(self, method: str, path: str, params: Optional[Dict[str, Any]],
+               response: requests.Response, elapsed_ms: float) -> None:
+        """Append a live response to the cassette."""
+        meta = {
+            "method": method.upper(),
+            "url": response.url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "encoding": response.encoding,
+            "headers": dict(response.headers),
+        }
+        payload = zlib.compress(json.dumps(meta).encode("utf-8") + b"\n" + response.content)
+        self._writer.write(payload)
+        entry = _Entry(self._offset, len(payload), elapsed_ms, exact_signature(method, path, params))
+        self.index.setdefault(self.policy.key(method, path, params), []).append(entry)
+        self._offset += len(payload)
+
+    def _write_index(self) -> None:
+        index = {
+            "version": INDEX_VERSION,
+            "entries": {
+                key: [[e.offset, e.length, round(e.elapsed_ms, 3), e.signature] for e in entries]
+                for key, entries in self.index.items()
+            },
+        }
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(index, handle, separators=(",", ":"))
+        os.replace(tmp_path, self.index_path)
+
+    # -- replay -----------------------------------------------------------
+
+    def _open_for_replay(self) -> None:
+        try:
+            with open(self.index_path, encoding="utf-8") as handle:
+                index = json.load(handle)
+            self._file = open(self.data_path, "rb")
+        except FileNotFoundError as exc:
+            raise CassetteError(f"Cassette not found: {self.path} (record it first)") from exc
+
+        if index.get("version") != INDEX_VERSION:
+            raise CassetteError(f"Unsupported cassette index version in {self.index_path}")
+        # The policy may differ from the one used while recording, so re-key
+        # every entry from its exact signature.
+        for entries in index["entries"].values():
+            for offset, length, elapsed_ms, signature in entries:
+                method, _, rest = signature.partition(" ")
+                path, _, query = rest.partition("?")
+                params = dict(parse_qsl(query, keep_blank_values=True)) if query else None
+                self.index.setdefault(self.policy.key(method, path, params), []).append(
+                    _Entry(offset, length, elapsed_ms, signature)
+                )
+        for entries in self.index.values():
+            entries.sort(key=lambda e: e.offset)
+
+        if os.path.getsize(self.data_path) > len(MAGIC):
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._mmap[:len(MAGIC)] != MAGIC:
+                raise CassetteError(f"Not a cassette file: {self.data_path}")
+
+    def _select(self, method: str, path: str, params: Optional[Dict[str, Any]]) -> _Entry:
+        key = self.policy.key(method, path, params)
+        candidates = self.index.get(key)
+        if not candidates:
+            raise CassetteMissError(f"No recorded interaction for {key} in {self.path}")
+        signature = exact_signature(method, path, params)
+        exact = [e for e in candidates if e.signature == signature]
+        unused_exact = [e for e in exact if not e.used]
+        if unused_exact:
+            unused_exact[0].used = True
+            return unused_exact[0]
+        # A repeated request replays its own recording rather than another ID's
+        if exact:
+            return exact[-1]
+        unused = [e for e in candidates if not e.used]
+        if unused:
+            unused[0].used = True
+            return unused[0]
+        # Every recording was consumed: keep serving the latest one
+        return candidates[-1]
+
+    def play(self, method: str, url: str, path: str, params: Optional[Dict[str, Any]]) -> Tuple[requests.Response, float]:
+        """Build the recorded response for a request; returns (response, recorded_ms)."""
+        entry = self._select(method, path, params)
+        if self._mmap is None or entry.offset + entry.length > len(self._mmap):
+            raise CassetteError(f"Cassette data file is empty or truncated: {self.data_path} (re-record it)")
+        raw = zlib.decompress(self._mmap[entry.offset:entry.offset + entry.length])
+        meta_bytes, _, content = raw.partition(b"\n")
+        meta = json.loads(meta_bytes)
+
+        if self.simulate_latency:
+            time.sleep(entry.elapsed_ms * self.latency_scale / 1000)
+
+        response = requests.Response()
+        response.status_code = meta["status"]
+        response.reason = meta["reason"]
+        response.encoding = meta["encoding"]
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response._content = content
+        response.url = meta["url"]
+        response.elapsed = timedelta(milliseconds=entry.elapsed_ms)
+        response.request = requests.Request(method, url, params=params).prepare()
+        return response, entry.elapsed_ms
+
+    # -- lifecycle --------------------------------------------------------
+
+    def close(self) -> None:
+        """Flush the recording (data then index) or release the mapping."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._write_index()
+            recorded = sum(len(entries) for entries in self.index.values())
+            logger.info(f"Cassette saved: {recorded} interactions -> {self.data_path}")
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -21,3 +21,13 @@ class APITimeoutError(APIError):
 class APIConnectionError(APIError):
     """Raised when the API client cannot establish a connection."""
     pass
+
+
+class CassetteError(APIError):
+    """Raised when a record/replay cassette is missing, corrupt or misconfigured."""
+    pass
+
+
+class CassetteMissError(CassetteError):
+    """Raised in replay mode when no recorded interaction matches a request."""
+    pass
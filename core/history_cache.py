@@ -0,0 +1,150 @@
+"""
+Local cache of position price-history windows.
+
+For every position the cache remembers which date ranges have already been
+fetched and keeps the closing prices as sorted NumPy arrays. A request for a
+window only asks the API for the sub-ranges that are not covered yet (an
+extended window costs one small request per position, a repeated window
+costs none), and the missing ranges of many positions are fetched
+concurrently.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.exceptions import APIError
+from services.positions_service import HISTORY_DATE_FORMAT
+
+if TYPE_CHECKING:
+    from models.position import HistoryPoint
+    from services.positions_service import PositionsService
+
+DateRange = Tuple[date, date]
+Window = Tuple[np.ndarray, np.ndarray]
+
+_ONE_DAY = timedelta(days=1)
+
+
+def point_date(value: int | str) -> date:
+    """HistoryPoint dates come back as epoch milliseconds or as date strings."""
+    if isinstance(value, int) or str(value).lstrip("-").isdigit():
+        return datetime.fromtimestamp(int(value) / 1000, tz=timezone.utc).date()
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        return datetime.strptime(value, HISTORY_DATE_FORMAT).date()
+
+
+def merge_ranges(ranges: Iterable[DateRange]) -> List[DateRange]:
+    """Sort and merge inclusive date ranges, joining adjacent ones."""
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + _ONE_DAY:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(start: date, end: date, covered: List[DateRange]) -> List[DateRange]:
+    """Parts of the inclusive range start..end not inside the (merged) covered ranges."""
+    gaps, cursor = [], start
+    for covered_start, covered_end in covered:
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start - _ONE_DAY))
+        cursor = max(cursor, covered_end + _ONE_DAY)
+        if cursor > end:
+            return gaps
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+@dataclass
+class CacheStats:
+    requests: int = 0
+    points_fetched: int = 0
+    windows_served: int = 0
+    windows_fully_cached: int = 0
+
+
+class PriceHistoryCache:
+    """
+    Caches GET /positions/{positionId}/{startDate}/{endDate} results.
+
+    window()/windows() return (day ordinals, closing prices) arrays for the
+    requested inclusive date range, fetching only what is missing.
+    """
+
+    def __init__(self, positions_service: "PositionsService", max_workers: int = 8):
+        self.positions_service = positions_service
+        self.max_workers = max_workers
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._covered: Dict[int, List[DateRange]] = {}
+        self._days: Dict[int, np.ndarray] = {}
+        self._prices: Dict[int, np.ndarray] = {}
+
+    def missing(self, position_id: int, start: date, end: date) -> List[DateRange]:
+        with self._lock:
+            return missing_ranges(start, end, self._covered.get(position_id, []))
+
+    def window(self, position_id: int, start: date, end: date) -> Window:
+        return self.windows([position_id], start, end)[position_id]
+
+    def windows(self, position_ids: Iterable[int], start: date, end: date) -> Dict[int, Window]:
+        """Fetch the missing parts for all positions concurrently, then slice the cache."""
+        position_ids = list(position_ids)
+        plan = [(position_id, gap) for position_id in position_ids for gap in self.missing(position_id, start, end)]
+        if plan:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                list(pool.map(lambda job: self._fetch(*job), plan))
+        fetched = {position_id for position_id, _ in plan}
+        lo, hi = start.toordinal(), end.toordinal()
+        result = {}
+        with self._lock:
+            self.stats.windows_served += len(position_ids)
+            self.stats.windows_fully_cached += len(set(position_ids) - fetched)
+            for position_id in position_ids:
+                days = self._days.get(position_id, np.empty(0, dtype=np.int64))
+                prices = self._prices.get(position_id, np.empty(0))
+                window = slice(np.searchsorted(days, lo), np.searchsorted(days, hi, side="right"))
+                result[position_id] = (days[window], prices[window])
+        return result
+
+    def invalidate(self, position_id: Optional[int] = None) -> None:
+        with self._lock:
+            for store in (self._covered, self._days, self._prices):
+                if position_id is None:
+                    store.clear()
+                else:
+                    store.pop(position_id, None)
+
+    def _fetch(self, position_id: int, gap: DateRange) -> None:
+        response, history = self.positions_service.get_position_history(
+            position_id, gap[0].strftime(HISTORY_DATE_FORMAT), gap[1].strftime(HISTORY_DATE_FORMAT))
+        if history is None:
+            raise APIError(f"Could not fetch price history of position {position_id} for {gap[0]}..{gap[1]}",
+                           status_code=response.status_code, response_body=response.text)
+        self._store(position_id, gap, history)
+
+    def _store(self, position_id: int, gap: DateRange, history: List["HistoryPoint"]) -> None:
+        new_days = np.fromiter((point_date(p.date).toordinal() for p in history), dtype=np.int64, count=len(history))
+        new_prices = np.fromiter((p.closingPrice for p in history), dtype=float, count=len(history))
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.points_fetched += len(history)
+            days = np.concatenate([self._days.get(position_id, np.empty(0, dtype=np.int64)), new_days])
+            prices = np.concatenate([self._prices.get(position_id, np.empty(0)), new_prices])
+            # Ranges never overlap, but a point on a boundary may be returned twice
+            days, first = np.unique(days, return_index=True)
+            self._days[position_id], self._prices[position_id] = days, prices[first]
+            self._covered[position_id] = merge_ranges(self._covered.get(position_id, []) + [gap])
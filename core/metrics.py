@@ -0,0 +1,66 @@
+"""
+Lightweight response-time metrics for the APIClient.
+
+Latencies are grouped per endpoint template (method + path with numeric IDs
+and dates replaced by placeholders), so /accounts/12345 and /accounts/13344
+aggregate together. Credential segments are replaced as well, so login
+passwords never end up in metric keys or reports.
+"""
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, List
+
+from core.cassette import MatchPolicy
+
+_TEMPLATES = MatchPolicy()
+# Path segments that carry secrets; they are templated before anything else
+_CREDENTIAL_PATHS = [
+    (re.compile(r"/login/[^/]+/[^/]+$"), "/login/{username}/{password}"),
+]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class LatencyRecorder:
+    """Collects response times and error counts per endpoint template."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    @staticmethod
+    def endpoint_key(method: str, endpoint: str) -> str:
+        for pattern, template in _CREDENTIAL_PATHS:
+            endpoint = pattern.sub(template, endpoint)
+        return f"{method.upper()} {_TEMPLATES.template_path(endpoint)}"
+
+    def record(self, method: str, endpoint: str, status_code: int, elapsed_ms: float) -> None:
+        key = self.endpoint_key(method, endpoint)
+        with self._lock:
+            self.samples[key].append(elapsed_ms)
+            if status_code >= 500:
+                self.errors[key] += 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """count / mean / p50 / p95 / max (ms) and 5xx errors per endpoint."""
+        result = {}
+        with self._lock:
+            for key, values in self.samples.items():
+                ordered = sorted(values)
+                result[key] = {
+                    "count": len(ordered),
+                    "mean": sum(ordered) / len(ordered),
+                    "p50": percentile(ordered, 0.50),
+                    "p95": percentile(ordered, 0.95),
+                    "max": ordered[-1],
+                    "errors": self.errors.get(key, 0),
+                }
+        return result
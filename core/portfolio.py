@@ -0,0 +1,91 @@
+"""
+NumPy portfolio analytics over position price histories.
+
+All positions are aligned on one day axis as a (days x positions) price
+matrix, so valuation over time, returns and drawdowns are a handful of
+vectorized operations whatever the number of positions.
+"""
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+@dataclass
+class PriceMatrix:
+    days: np.ndarray          # date ordinals, ascending
+    position_ids: np.ndarray
+    prices: np.ndarray        # (days, positions), forward-filled; NaN before a position's first quote
+
+    @property
+    def dates(self) -> List[date]:
+        return [date.fromordinal(int(day)) for day in self.days]
+
+
+@dataclass
+class PortfolioAnalytics:
+    days: np.ndarray
+    values: np.ndarray                  # portfolio market value per day
+    cost_basis: float
+    daily_returns: np.ndarray           # len(days) - 1
+    cumulative_returns: np.ndarray      # relative to the first day
+    drawdowns: np.ndarray               # value / running peak - 1 (<= 0)
+    max_drawdown: float
+    unrealized_pnl: float               # last value - cost basis
+    position_returns: np.ndarray        # per position, first to last day
+    position_max_drawdowns: np.ndarray  # per position
+
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    """Carry the last non-NaN value down each column; leading NaNs stay NaN."""
+    rows = np.arange(values.shape[0])[:, None]
+    last_valid = np.where(np.isnan(values), 0, rows)
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+    return values[last_valid, np.arange(values.shape[1])]
+
+
+def build_price_matrix(windows: Dict[int, Tuple[np.ndarray, np.ndarray]]) -> PriceMatrix:
+    """Align per-position (day ordinals, prices) windows on the union of their days."""
+    position_ids = np.fromiter(windows, dtype=np.int64, count=len(windows))
+    all_days = [days for days, _ in windows.values()]
+    flat_days = np.concatenate(all_days) if all_days else np.empty(0, dtype=np.int64)
+    flat_prices = np.concatenate([prices for _, prices in windows.values()]) if all_days else np.empty(0)
+    days = np.unique(flat_days)
+    columns = np.repeat(np.arange(len(position_ids)), [len(d) for d in all_days])
+    prices = np.full((len(days), len(position_ids)), np.nan)
+    prices[np.searchsorted(days, flat_days), columns] = flat_prices
+    return PriceMatrix(days=days, position_ids=position_ids, prices=forward_fill(prices))
+
+
+def analyze_portfolio(matrix: PriceMatrix, shares: np.ndarray, purchase_prices: np.ndarray) -> PortfolioAnalytics:
+    """
+    Value the holdings (shares and purchase price per matrix column) over the
+    matrix's days. A position is valued at its purchase price until its first
+    quote in the window.
+    """
+    shares = np.asarray(shares, dtype=float)
+    purchase_prices = np.asarray(purchase_prices, dtype=float)
+    prices = np.where(np.isnan(matrix.prices), purchase_prices, matrix.prices)
+    values = prices @ shares
+    cost_basis = float(purchase_prices @ shares)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        daily_returns = values[1:] / values[:-1] - 1
+        cumulative_returns = values / values[0] - 1 if len(values) else values
+        drawdowns = values / np.maximum.accumulate(values) - 1 if len(values) else values
+        position_returns = prices[-1] / prices[0] - 1 if len(prices) else np.zeros(len(shares))
+        position_drawdowns = prices / np.maximum.accumulate(prices, axis=0) - 1
+
+    return PortfolioAnalytics(
+        days=matrix.days,
+        values=values,
+        cost_basis=cost_basis,
+        daily_returns=daily_returns,
+        cumulative_returns=cumulative_returns,
+        drawdowns=drawdowns,
+        max_drawdown=float(drawdowns.min()) if len(drawdowns) else 0.0,
+        unrealized_pnl=float(values[-1] - cost_basis) if len(values) else 0.0,
+        position_returns=position_returns,
+        position_max_drawdowns=position_drawdowns.min(axis=0) if len(prices) else np.zeros(len(shares)),
+    )
@@ -64,6 +64,21 @@ class TransactionDateRange:
     TO_DATE: str = "12-31-2023"
 
 
+@dataclass(frozen=True)
+class PositionData:
+    """Test parameters for buying, selling and pricing positions."""
+    NAME: str = "Apple Inc."
+    SYMBOL: str = "AAPL"
+    SHARES: int = 10
+    SELL_SHARES: int = 4
+    PRICE_PER_SHARE: float = 25.00
+    INVALID_ID: int = 999999
+    HISTORY_FROM_DATE: str = "01-01-2023"
+    HISTORY_TO_DATE: str = "03-31-2023"
+    # Extends the window above by one month, for cache reuse checks
+    HISTORY_EXTENDED_TO_DATE: str = "04-30-2023"
+
+
 # Singleton instances for easy import
 DEFAULT_CUSTOMER = DefaultCustomer()
 DEFAULT_CREDENTIALS = DefaultCredentials()
@@ -72,3 +87,4 @@ ACCOUNT_DATA = AccountData()
 INVALID_DATA = InvalidData()
 LOAN_DATA = LoanData()
 TRANSACTION_DATES = TransactionDateRange()
+POSITION_DATA = PositionData()
@@ -1,15 +1,42 @@
+import os
+
 import pytest
-from core.api_client import APIClient
-from config.settings import settings
 
 
 @pytest.fixture(scope="session")
-def api_client():
+def api_client(target, latency_recorder):
     """
     Session-scoped fixture to provide a configured API client.
     Passes TIMEOUT from settings for consistent request timeout enforcement.
+    Each target (see plugins/multi_target.py) gets its own client and
+    connection pool; response times feed that target's latency recorder.
+    When CASSETTE_MODE is "record" or "replay", traffic is recorded to or
+    replayed from the cassette at CASSETTE_PATH; named targets each get their
+    own cassette at CASSETTE_PATH/<target name>.
     """
-    client = APIClient(base_url=settings.BASE_URL, timeout=settings.TIMEOUT)
+    # Imported here so collection-only runs skip requests and pydantic-settings
+    from core.api_client import APIClient
+    from core.cassette import Cassette
+    from config.settings import settings
+    from plugins.multi_target import DEFAULT_TARGET_NAME
+
+    cassette = None
+    if settings.CASSETTE_MODE != "off":
+        # Targets never share a cassette: concurrent writers would corrupt it, and
+        # replaying one target's traffic for every target makes the comparison meaningless
+        path = settings.CASSETTE_PATH
+        if target.name != DEFAULT_TARGET_NAME:
+            path = os.path.join(settings.CASSETTE_PATH, target.name)
+        cassette = Cassette(
+            path,
+            mode=settings.CASSETTE_MODE,
+            simulate_latency=settings.CASSETTE_SIMULATE_LATENCY,
+            latency_scale=settings.CASSETTE_LATENCY_SCALE,
+        )
+    client = APIClient(base_url=target.base_url, timeout=settings.TIMEOUT, cassette=cassette,
+                       latency_recorder=latency_recorder)
     yield client
     # Teardown logic
     client.session.close()
+    if cassette is not None:
+        cassette.close()
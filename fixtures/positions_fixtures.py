@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import pytest
+from typing import TYPE_CHECKING
+
+from data.test_data import ACCOUNT_DATA, DEFAULT_CUSTOMER, POSITION_DATA
+
+if TYPE_CHECKING:
+    from core.history_cache import PriceHistoryCache
+    from models.position import Position
+    from services import PositionsService
+
+
+@pytest.fixture
+def position(positions_service: PositionsService) -> Position:
+    """A freshly bought position, funded from the default account."""
+    _, positions = positions_service.buy_position(
+        customer_id=DEFAULT_CUSTOMER.ID,
+        account_id=ACCOUNT_DATA.DEFAULT_ID,
+        name=POSITION_DATA.NAME,
+        symbol=POSITION_DATA.SYMBOL,
+        shares=POSITION_DATA.SHARES,
+        price_per_share=POSITION_DATA.PRICE_PER_SHARE
+    )
+    assert positions, "Prerequisite failed: could not buy a position."
+    return max((p for p in positions if p.symbol == POSITION_DATA.SYMBOL), key=lambda p: p.positionId)
+
+
+@pytest.fixture
+def history_cache(positions_service: PositionsService) -> PriceHistoryCache:
+    """An empty price-history cache in front of the positions service."""
+    # core.history_cache pulls in NumPy, so it loads only for tests that use the cache
+    from core.history_cache import PriceHistoryCache
+
+    return PriceHistoryCache(positions_service)
@@ -1,47 +1,64 @@
+from __future__ import annotations
+
 import pytest
 import logging
-from core.api_client import APIClient
-from services.customers_service import CustomersService
-from services.auth_service import AuthService
-from services.accounts_service import AccountsService
-from services.loans_service import LoansService
-from services.admin_service import AdminService
+from typing import TYPE_CHECKING, List
+
+# Services resolve lazily on first fixture use, so collecting a single test
+# module only imports the services that module itself needs.
+import services
+
+if TYPE_CHECKING:
+    from core.api_client import APIClient
+    from services import AccountsService, AdminService, AuthService, CustomersService, LoansService, PositionsService
 
 logger = logging.getLogger(__name__)
 
 
 @pytest.fixture(scope="session")
 def customers_service(api_client: APIClient) -> CustomersService:
-    return CustomersService(api_client=api_client)
+    return services.CustomersService(api_client=api_client)
 
 
 @pytest.fixture(scope="session")
 def auth_service(api_client: APIClient) -> AuthService:
-    return AuthService(api_client=api_client)
+    return services.AuthService(api_client=api_client)
 
 
 @pytest.fixture(scope="session")
 def accounts_service(api_client: APIClient) -> AccountsService:
-    return AccountsService(api_client=api_client)
+    return services.AccountsService(api_client=api_client)
 
 
 @pytest.fixture(scope="session")
 def loans_service(api_client: APIClient) -> LoansService:
-    return LoansService(api_client=api_client)
+    return services.LoansService(api_client=api_client)
+
+
+@pytest.fixture(scope="session")
+def positions_service(api_client: APIClient) -> PositionsService:
+    return services.PositionsService(api_client=api_client)
 
 
 @pytest.fixture(scope="session")
 def admin_service(api_client: APIClient) -> AdminService:
-    return AdminService(api_client=api_client)
+    return services.AdminService(api_client=api_client)
 
 
 @pytest.fixture(scope="session", autouse=True)
-def db_setup(admin_service: AdminService):
+def db_setup(request: pytest.FixtureRequest, admin_service: AdminService):
     """
     Session-scoped auto-use fixture that initializes the Parabank database
     before any tests run. This guarantees deterministic test state and
     eliminates the need for pytest.skip() fallbacks.
+    Under --workers the parent process initializes the database once
+    (see pytest_scheduler_prepare_workers below) and workers skip this,
+    so no worker resets the database while another is mid-test.
     """
+    if request.config.getoption("scheduler_worker", default=False):
+        logger.info("Database initialized by the parent process; skipping db_setup in this worker.")
+        yield
+        return
     logger.info("Initializing Parabank database for test session...")
     response = admin_service.initialize_db()
     assert response.status_code in [200, 204], (
@@ -51,3 +68,35 @@ def db_setup(admin_service: AdminService):
     yield
     # Optional: clean up after the entire session
     logger.info("Test session complete.")
+
+
+def pytest_scheduler_prepare_workers(config: pytest.Config, items: List[pytest.Item]) -> None:
+    """Initialize the database once for all --workers processes (they skip db_setup)."""
+    # Backend-free runs (e.g. tests/unit) have no database to prepare
+    if not any("target" in getattr(item, "fixturenames", ()) for item in items):
+        return
+    from config.settings import settings
+    from core.api_client import APIClient
+    from core.exceptions import APIError
+    from plugins.multi_target import PLUGIN_NAME
+
+    target = config.pluginmanager.get_plugin(PLUGIN_NAME).get_targets()[0]
+    if settings.CASSETTE_MODE == "record":
+        pytest.exit("--workers cannot record a cassette: every worker would write the same files",
+                    returncode=pytest.ExitCode.USAGE_ERROR)
+    if settings.CASSETTE_MODE == "replay":
+        # No live backend to initialize: every worker replays its responses from the cassette
+        return
+
+    client = APIClient(base_url=target.base_url, timeout=settings.TIMEOUT)
+    logger.info(f"Initializing Parabank database at {target.base_url} for all workers...")
+    try:
+        response = services.AdminService(api_client=client).initialize_db()
+    except APIError as exc:
+        pytest.exit(f"Failed to initialize database before starting workers: {exc}",
+                    returncode=pytest.ExitCode.TESTS_FAILED)
+    finally:
+        client.session.close()
+    if response.status_code not in [200, 204]:
+        pytest.exit(f"Failed to initialize database before starting workers. Status: {response.status_code}",
+                    returncode=pytest.ExitCode.TESTS_FAILED)
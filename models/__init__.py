@@ -1 +1,25 @@
 # Identifies the models directory as a Python package.
+# Models are also exported lazily (PEP 562): `from models import Account`
+# imports only models/account.py, and only on first access.
+import importlib
+
+_LAZY_EXPORTS = {
+    "Account": "models.account",
+    "Address": "models.customer",
+    "Customer": "models.customer",
+    "HistoryPoint": "models.position",
+    "LoanResponse": "models.loan",
+    "Position": "models.position",
+    "Transaction": "models.transaction",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
@@ -6,4 +6,4 @@ class Account(BaseModel):
     type: str  # e.g., CHECKING, SAVINGS, LOAN
     balance: float
     
-    model_config = ConfigDict(extra='ignore')
+    model_config = ConfigDict(extra='ignore', defer_build=True)
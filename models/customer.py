@@ -7,6 +7,9 @@ class Address(BaseModel):
     state: str
     zipCode: str
 
+    # Schema is built on first validation rather than at import time
+    model_config = ConfigDict(defer_build=True)
+
 class Customer(BaseModel):
     id: int
     firstName: str
@@ -16,4 +19,4 @@ class Customer(BaseModel):
     ssn: Optional[str] = None
     
     # Configure pydantic to ignore extra fields if the API adds them
-    model_config = ConfigDict(extra='ignore')
+    model_config = ConfigDict(extra='ignore', defer_build=True)
@@ -8,4 +8,4 @@ class LoanResponse(BaseModel):
     message: str
     accountId: Optional[int] = None
     
-    model_config = ConfigDict(extra='ignore')
+    model_config = ConfigDict(extra='ignore', defer_build=True)
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, ConfigDict
+
+class Position(BaseModel):
+    positionId: int
+    customerId: int
+    name: str
+    symbol: str
+    shares: int
+    purchasePrice: float
+    
+    model_config = ConfigDict(extra='ignore', defer_build=True)
+
+
+class HistoryPoint(BaseModel):
+    symbol: str
+    date: int | str  # Note: Can be timestamp or ISO string
+    closingPrice: float
+    
+    model_config = ConfigDict(extra='ignore', defer_build=True)
@@ -8,4 +8,4 @@ class Transaction(BaseModel):
     amount: float
     description: str
     
-    model_config = ConfigDict(extra='ignore')
+    model_config = ConfigDict(extra='ignore', defer_build=True)
@@ -0,0 +1 @@
+# Identifies the plugins directory as a Python package.
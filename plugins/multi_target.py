@@ -0,0 +1,340 @@
+"""
+Multi-target mode: run the suite against several Parabank environments.
+
+Targets come from ``--targets`` or the ``BASE_URLS`` setting as a
+comma-separated list of ``url`` or ``name=url`` entries. The session-scoped
+``target`` fixture (and through it ``api_client`` and every service fixture)
+is bound to one target, so each target gets its own client and connection
+pool.
+
+By default targets run concurrently: the main process collects once, then
+starts one pytest process per target and waits for all of them. With
+``--targets-sequential`` the fixtures are parametrized per target and run in
+this process instead. Either way the summary compares pass/fail per test and
+latency per endpoint side by side.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import pytest
+
+PLUGIN_NAME = "multi-target"
+# Name of the single target taken from BASE_URL
+DEFAULT_TARGET_NAME = "default"
+# Worst outcome wins when setup/call/teardown disagree
+OUTCOME_RANK = {"passed": 0, "skipped": 1, "xfail": 1, "xpass": 2, "failed": 3, "error": 3}
+
+
+@dataclass(frozen=True)
+class Target:
+    name: str
+    base_url: str
+
+
+def parse_targets(value: str) -> List[Target]:
+    """Parse ``url`` / ``name=url`` entries; unnamed targets are named by host."""
+    entries = []
+    for part in (p.strip() for p in value.split(",")):
+        if not part:
+            continue
+        name, sep, url = part.partition("=")
+        if not sep or "://" in name:
+            name, url = "", part
+        url = url.rstrip("/")
+        # Names end up in test ids and file names; "-" is reserved as the pytest id separator
+        entries.append((re.sub(r"[^\w.]", "_", name or urlsplit(url).netloc or url), url))
+
+    names = [name for name, _ in entries]
+    return [
+        Target(name if names.count(name) == 1 else f"{name}_{i + 1}", url)
+        for i, (name, url) in enumerate(entries)
+    ]
+
+
+def _strip_options(args: List[str], flags: Tuple[str, ...], valued: Tuple[str, ...]) -> List[str]:
+    """Remove flags and ``--opt value`` / ``--opt=value`` options from a command line."""
+    result, skip = [], False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg in flags:
+            continue
+        elif arg in valued:
+            skip = True
+        elif not any(arg.startswith(f"{opt}=") for opt in valued):
+            result.append(arg)
+    return result
+
+
+def _uses_target(items: List[pytest.Item]) -> bool:
+    """Whether any item talks to a target (backend-free runs such as tests/unit do not)."""
+    return any("target" in getattr(item, "fixturenames", ()) for item in items)
+
+
+def _shorten(text: str, width: int) -> str:
+    """Fit text into width, replacing its start with "..." so the test name stays readable."""
+    return text if len(text) <= width else "..." + text[len(text) - width + 3:]
+
+
+class MultiTargetPlugin:
+    """Resolves targets, fans out or parametrizes, and reports the comparison."""
+
+    def __init__(self, config: pytest.Config):
+        self.config = config
+        self.sequential = config.getoption("targets_sequential")
+        self.output_path: Optional[str] = config.getoption("multi_target_output")
+        self.report_path: Optional[str] = config.getoption("multi_target_report")
+        self._targets: Optional[List[Target]] = None
+        self._item_targets: Dict[str, Tuple[str, str]] = {}
+        # Tests that use a target; only these are compared across targets
+        self._target_nodeids: set = set()
+        self.outcomes: Dict[str, Dict[str, str]] = {}
+        self.latency: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self.recorders: Dict[str, object] = {}
+        self.wall: Dict[str, float] = {}
+        self._start: Optional[float] = None
+
+    # Methods rather than properties: pytest getattr()s every plugin attribute
+    # while scanning for fixtures, which would resolve settings at collection.
+    def get_targets(self) -> List[Target]:
+        """Targets from --targets, else BASE_URLS, else the single BASE_URL."""
+        if self._targets is None:
+            option = self.config.getoption("targets")
+            if option:
+                self._targets = parse_targets(option)
+            else:
+                # Resolved on demand so plain runs never pay for settings at collection
+                from pydantic import ValidationError
+                from config.settings import settings
+                try:
+                    self._targets = (parse_targets(settings.BASE_URLS)
+                                     or [Target(DEFAULT_TARGET_NAME, settings.BASE_URL)])
+                except ValidationError as exc:
+                    problems = "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors())
+                    raise pytest.UsageError(
+                        f"Invalid settings ({problems}). Set them in .env or the environment "
+                        f"(see .env.example), or pass --targets."
+                    ) from None
+            if not self._targets:
+                raise pytest.UsageError("--targets did not contain any base URL")
+        return self._targets
+
+    def has_multiple_targets(self) -> bool:
+        return len(self.get_targets()) > 1
+
+    # -- sequential: parametrize fixtures per target ----------------------
+
+    def pytest_generate_tests(self, metafunc: pytest.Metafunc) -> None:
+        if self.sequential and "target" in metafunc.fixturenames and self.has_multiple_targets():
+            targets = self.get_targets()
+            metafunc.parametrize("target", targets, ids=[t.name for t in targets], indirect=True, scope="session")
+
+    def pytest_collection_modifyitems(self, config: pytest.Config, items: List[pytest.Item]) -> None:
+        self._target_nodeids = {item.nodeid for item in items if _uses_target([item])}
+        if self.output_path:
+            # Child process of a concurrent run: backend-free tests run once, in the parent
+            deselected = [item for item in items if item.nodeid not in self._target_nodeids]
+            if deselected:
+                config.hook.pytest_deselected(items=deselected)
+                items[:] = [item for item in items if item.nodeid in self._target_nodeids]
+        for item in items:
+            callspec = getattr(item, "callspec", None)
+            target = callspec.params.get("target") if callspec else None
+            if isinstance(target, Target):
+                # Drop the target's id so the same test lines up across targets
+                prefix, _, ids = item.nodeid.partition("[")
+                other_ids = [i for i in ids[:-1].split("-") if i != target.name] if ids else []
+                base = f"{prefix}[{'-'.join(other_ids)}]" if other_ids else prefix
+                self._item_targets[item.nodeid] = (target.name, base)
+
+    def pytest_collection_finish(self, session: pytest.Session) -> None:
+        # Checked here: the scheduler's runtestloop would start its workers before ours runs
+        if self.sequential or self.output_path or self.config.getoption("workers", 1) <= 1:
+            return
+        if _uses_target(session.items) and self.has_multiple_targets():
+            raise pytest.UsageError("--workers cannot be combined with multiple targets")
+
+    # -- concurrent: one pytest process per target ------------------------
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session: pytest.Session) -> Optional[bool]:
+        if session.config.option.collectonly or self.sequential or self.output_path:
+            return None
+        # Backend-free runs (e.g. tests/unit) have no target to fan out to or resolve settings for
+        if not _uses_target(session.items):
+            return None
+        if not self.has_multiple_targets():
+            return None
+
+        args = _strip_options(list(self.config.invocation_params.args),
+                              flags=("--targets-sequential",), valued=("--targets", "--multi-target-report"))
+        procs = []
+        with tempfile.TemporaryDirectory(prefix="multi-target-") as tmp:
+            for target in self.get_targets():
+                output = os.path.join(tmp, f"{target.name}.json")
+                cmd = [sys.executable, "-m", "pytest", *args,
+                       "--targets", f"{target.name}={target.base_url}", "--multi-target-output", output,
+                       # Durations from different environments are not comparable; keep them out of the store
+                       "--scheduler-output", os.path.join(tmp, f"{target.name}.durations.json")]
+                if self.config.pluginmanager.hasplugin("html"):
+                    cmd.append(f"--html=report-{target.name}.html")
+                procs.append((target, output, subprocess.Popen(
+                    cmd, cwd=str(self.config.invocation_params.dir),
+                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                )))
+
+            for target, output, proc in procs:
+                log, _ = proc.communicate()
+                sys.stdout.write(f"\n{'=' * 20} target {target.name} ({target.base_url}) {'=' * 20}\n{log}")
+                if proc.returncode not in (0, 5):
+                    session.testsfailed += 1
+                try:
+                    with open(output, encoding="utf-8") as handle:
+                        data = json.load(handle)
+                except (OSError, ValueError):
+                    self.outcomes[target.name] = {}
+                    continue
+                self.outcomes[target.name] = data["outcomes"]
+                self.latency[target.name] = data["latency"]
+                self.wall[target.name] = data["wall"]
+
+        # The children skipped tests that use no target; run them once here
+        local = [item for item in session.items if item.nodeid not in self._target_nodeids]
+        for i, item in enumerate(local):
+            next_item = local[i + 1] if i + 1 < len(local) else None
+            item.config.hook.pytest_runtest_protocol(item=item, nextitem=next_item)
+            if session.shouldfail or session.shouldstop:
+                break
+        return True
+
+    # -- collecting results -----------------------------------------------
+
+    def pytest_runtest_logstart(self, nodeid: str, location) -> None:
+        if self._start is None:
+            self._start = time.perf_counter()
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if report.nodeid not in self._target_nodeids or self._targets is None:
+            # Tests that use no target behave the same everywhere; keep them out of the comparison
+            return
+        target, base = self._item_targets.get(report.nodeid, (self._targets[0].name, report.nodeid))
+        if report.failed:
+            outcome = "failed" if report.when == "call" else "error"
+        elif report.skipped:
+            outcome = "xfail" if hasattr(report, "wasxfail") else "skipped"
+        elif hasattr(report, "wasxfail"):
+            outcome = "xpass"
+        else:
+            outcome = "passed"
+        results = self.outcomes.setdefault(target, {})
+        if OUTCOME_RANK[outcome] >= OUTCOME_RANK[results.get(base, "passed")]:
+            results[base] = outcome
+
+    def register_recorder(self, target: Target, recorder) -> None:
+        self.recorders[target.name] = recorder
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        for name, recorder in self.recorders.items():
+            self.latency[name] = recorder.summary()
+        if self.output_path:
+            # Child process: hand results to the parent instead of reporting. Its
+            # wall time covers one target; sequential runs interleave targets, so have none.
+            name = self.get_targets()[0].name
+            wall = time.perf_counter() - self._start if self._start else 0.0
+            with open(self.output_path, "w", encoding="utf-8") as handle:
+                json.dump({"outcomes": self.outcomes.get(name, {}), "latency": self.latency.get(name, {}),
+                           "wall": wall}, handle)
+
+    # -- reporting --------------------------------------------------------
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if self.output_path or len(self.outcomes) < 2:
+            return
+        names = [t.name for t in self.get_targets()]
+        width = max(12, *(len(n) + 2 for n in names))
+        tests = sorted({base for results in self.outcomes.values() for base in results})
+        test_width = min(80, max((len(t) for t in tests), default=10) + 2)
+
+        terminalreporter.section("multi-target comparison")
+        terminalreporter.write_line("".join([f"{'test':<{test_width}}", *(f"{n:>{width}}" for n in names)]))
+        for test in tests:
+            row = [self.outcomes.get(n, {}).get(test, "-") for n in names]
+            marker = "" if len(set(row)) == 1 else "  <- differs"
+            terminalreporter.write_line(
+                "".join([f"{_shorten(test, test_width - 2):<{test_width}}", *(f"{o:>{width}}" for o in row)]) + marker
+            )
+        totals = [sum(o in ("passed", "xfail") for o in self.outcomes.get(n, {}).values()) for n in names]
+        terminalreporter.write_line("".join([f"{'ok / total':<{test_width}}",
+                                             *(f"{f'{ok}/{len(self.outcomes.get(n, {}))}':>{width}}"
+                                               for ok, n in zip(totals, names))]))
+        if self.wall:
+            terminalreporter.write_line("".join([f"{'wall time (s)':<{test_width}}",
+                                                 *(f"{self.wall.get(n, 0.0):>{width}.2f}" for n in names)]))
+
+        endpoints = sorted({e for summary in self.latency.values() for e in summary})
+        if endpoints:
+            endpoint_width = max(len(e) for e in endpoints) + 2
+            cell = max(width, 22)
+            terminalreporter.write_line("")
+            terminalreporter.write_line("".join([f"{'latency p50/p95 ms (n)':<{endpoint_width}}",
+                                                 *(f"{n:>{cell}}" for n in names)]))
+            for endpoint in endpoints:
+                cells = []
+                for n in names:
+                    stats = self.latency.get(n, {}).get(endpoint)
+                    cells.append("-" if stats is None else
+                                 f"{stats['p50']:.0f}/{stats['p95']:.0f} ({stats['count']})")
+                terminalreporter.write_line("".join([f"{endpoint:<{endpoint_width}}", *(f"{c:>{cell}}" for c in cells)]))
+
+        if self.report_path:
+            with open(self.report_path, "w", encoding="utf-8") as handle:
+                json.dump({"targets": [t.__dict__ for t in self.get_targets()], "outcomes": self.outcomes,
+                           "latency": self.latency, "wall": self.wall}, handle, indent=2)
+            terminalreporter.write_line(f"\ncomparison written to {self.report_path}")
+
+
+@pytest.fixture(scope="session")
+def target(request: pytest.FixtureRequest) -> Target:
+    """The environment this session's clients talk to (parametrized per target when sequential)."""
+    return getattr(request, "param", None) or request.config.pluginmanager.get_plugin(PLUGIN_NAME).get_targets()[0]
+
+
+@pytest.fixture(scope="session")
+def latency_recorder(request: pytest.FixtureRequest, target: Target):
+    """Per-target response-time recorder fed by the api_client."""
+    from core.metrics import LatencyRecorder
+
+    recorder = LatencyRecorder()
+    request.config.pluginmanager.get_plugin(PLUGIN_NAME).register_recorder(target, recorder)
+    return recorder
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("multi-target", "run the suite against several environments")
+    group.addoption(
+        "--targets", default=None, metavar="URLS",
+        help="Comma-separated base URLs (url or name=url); overrides BASE_URLS / BASE_URL.",
+    )
+    group.addoption(
+        "--targets-sequential", action="store_true", default=False,
+        help="Parametrize fixtures per target in this process instead of one process per target.",
+    )
+    group.addoption(
+        "--multi-target-report", default=None, metavar="PATH",
+        help="Also write the per-target comparison as JSON.",
+    )
+    # Internal: where a per-target child process writes its results for the parent
+    group.addoption("--multi-target-output", default=None, help=argparse.SUPPRESS)
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.pluginmanager.register(MultiTargetPlugin(config), PLUGIN_NAME)
@@ -0,0 +1,441 @@
+"""
+Duration-aware test scheduling for sharded and parallel runs.
+
+Records historical per-test durations into a JSON store and uses them to
+balance tests across CI shards (``--shard 3/8``) or local worker processes
+(``--workers 4``) with longest-processing-time-first (LPT) assignment.
+Shard runs treat the store as a read-only snapshot so that every shard of a
+CI run computes the same plan; their timings go to ``--scheduler-output``
+files that ``tools.merge_durations`` folds back into the store.
+
+Session-scoped fixture setup (e.g. ``db_setup``) is timed separately from the
+tests that trigger it: every worker pays that cost once, so the planner charges
+it to a worker only the first time it receives a test needing that fixture.
+Tests sharing a module-, class- or package-scoped fixture are kept together as
+one unit so those fixtures are not set up on several workers.
+
+Workers share one backend, so with ``--workers`` the parent prepares it once
+(``pytest_scheduler_prepare_workers``, implemented by the services fixtures to
+initialize the database) and tests marked ``serial`` -- those that reset
+shared state -- run in the parent after all workers have finished. Workers
+send their test reports back, so the parent's summary counts every test.
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DURATIONS_PATH = ".test_durations.json"
+DEFAULT_TEST_DURATION = 1.0
+# Weight of the newest observation when folding it into the stored history
+SMOOTHING = 0.5
+# Scopes whose fixtures force their tests onto the same worker, broadest first
+GROUPING_SCOPES = ("package", "module", "class")
+# Marker for tests that must not overlap with anything else (e.g. /cleanDB)
+SERIAL_MARKER = "serial"
+
+
+@dataclass
+class WorkUnit:
+    """A group of tests that must run on the same worker."""
+    key: str
+    nodeids: List[str]
+    duration: float
+    session_fixtures: frozenset = frozenset()
+
+
+@dataclass
+class WorkerPlan:
+    """The units assigned to one worker and its predicted run time."""
+    index: int
+    units: List[WorkUnit] = field(default_factory=list)
+    fixtures: set = field(default_factory=set)
+    load: float = 0.0
+
+    @property
+    def nodeids(self) -> List[str]:
+        return [nodeid for unit in self.units for nodeid in unit.nodeids]
+
+
+class DurationStore:
+    """JSON-backed history of per-test and per-session-fixture durations."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tests: Dict[str, float] = {}
+        self.fixtures: Dict[str, float] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as handle:
+                    data = json.load(handle)
+                self.tests = {k: float(v) for k, v in data.get("tests", {}).items()}
+                self.fixtures = {k: float(v) for k, v in data.get("fixtures", {}).items()}
+            except (OSError, ValueError) as exc:
+                logger.warning(f"Ignoring unreadable durations file {path}: {exc}")
+
+    def estimate(self, nodeid: str) -> float:
+        """Historical duration of a test, or the mean of known tests if unseen."""
+        if nodeid in self.tests:
+            return self.tests[nodeid]
+        if self.tests:
+            return statistics.fmean(self.tests.values())
+        return DEFAULT_TEST_DURATION
+
+    def update(self, tests: Dict[str, float], fixtures: Dict[str, float]) -> None:
+        """Fold new observations into the history with exponential smoothing."""
+        for target, observed in ((self.tests, tests), (self.fixtures, fixtures)):
+            for key, seconds in observed.items():
+                previous = target.get(key)
+                target[key] = seconds if previous is None else (
+                    SMOOTHING * seconds + (1 - SMOOTHING) * previous
+                )
+
+    def save(self) -> None:
+        data = {
+            "tests": dict(sorted(self.tests.items())),
+            "fixtures": dict(sorted(self.fixtures.items())),
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse a 1-based ``K/N`` shard spec."""
+    try:
+        index, total = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise pytest.UsageError(f"--shard expects K/N (e.g. 3/8), got {value!r}")
+    if total < 1 or not 1 <= index <= total:
+        raise pytest.UsageError(f"--shard {value}: K must be between 1 and N")
+    return index, total
+
+
+def _fixture_scopes(item: pytest.Item) -> Dict[str, str]:
+    """Map each fixture an item uses to the scope of its active definition."""
+    fixtureinfo = getattr(item, "_fixtureinfo", None)
+    if fixtureinfo is None:
+        return {}
+    return {
+        name: defs[-1].scope
+        for name, defs in fixtureinfo.name2fixturedefs.items()
+        if defs
+    }
+
+
+def _group_key(item: pytest.Item, scopes: Dict[str, str]) -> str:
+    """Key tests that share a non-session, non-function fixture together."""
+    used = set(scopes.values())
+    path = item.nodeid.split("::")[0]
+    for scope in GROUPING_SCOPES:
+        if scope not in used:
+            continue
+        if scope == "package":
+            return os.path.dirname(path) or path
+        if scope == "module":
+            return path
+        if item.cls is not None:
+            return f"{path}::{item.cls.__name__}"
+    return item.nodeid
+
+
+def build_units(items: List[pytest.Item], store: DurationStore) -> List[WorkUnit]:
+    """Group collected items into schedulable units, preserving collection order."""
+    units: Dict[str, WorkUnit] = {}
+    for item in items:
+        scopes = _fixture_scopes(item)
+        key = _group_key(item, scopes)
+        session_fixtures = frozenset(n for n, s in scopes.items() if s == "session")
+        unit = units.get(key)
+        if unit is None:
+            units[key] = WorkUnit(key, [item.nodeid], store.estimate(item.nodeid), session_fixtures)
+        else:
+            unit.nodeids.append(item.nodeid)
+            unit.duration += store.estimate(item.nodeid)
+            unit.session_fixtures = unit.session_fixtures | session_fixtures
+    return list(units.values())
+
+
+def plan_schedule(units: List[WorkUnit], workers: int, fixture_costs: Dict[str, float]) -> List[WorkerPlan]:
+    """
+    Assign units to workers, longest first, each to the worker whose finish
+    time grows least. A worker is charged a session fixture's setup cost only
+    for the first unit it receives that needs it. Ties break on unit key and
+    worker index, so every process computes the same plan.
+    """
+    plans = [WorkerPlan(index=i) for i in range(workers)]
+    for unit in sorted(units, key=lambda u: (-u.duration, u.key)):
+        def finish_time(plan: WorkerPlan) -> Tuple[float, float, int]:
+            extra = sum(fixture_costs.get(f, 0.0) for f in unit.session_fixtures - plan.fixtures)
+            return plan.load + unit.duration + extra, plan.load, plan.index
+
+        best = min(plans, key=finish_time)
+        best.load = finish_time(best)[0]
+        best.units.append(unit)
+        best.fixtures |= unit.session_fixtures
+    return plans
+
+
+class DurationScheduler:
+    """Pytest plugin that records durations and applies shard/worker plans."""
+
+    def __init__(self, config: pytest.Config):
+        self.config = config
+        self.store = DurationStore(os.path.join(config.rootpath, config.getoption("durations_path")))
+        self.shard = parse_shard(config.getoption("shard")) if config.getoption("shard") else None
+        self.workers = config.getoption("workers")
+        self.output_path: Optional[str] = config.getoption("scheduler_output")
+        self.is_worker: bool = config.getoption("scheduler_worker")
+        if self.workers < 1:
+            raise pytest.UsageError("--workers must be at least 1")
+        if self.shard and self.workers > 1:
+            raise pytest.UsageError("--shard and --workers cannot be combined")
+
+        self.plans: List[WorkerPlan] = []
+        self.serial_items: List[pytest.Item] = []
+        self.observed_tests: Dict[str, float] = {}
+        self.observed_fixtures: Dict[str, float] = {}
+        self._fixture_overhead: Dict[str, float] = {}
+        self._current_nodeid: Optional[str] = None
+        self._first_start: Optional[float] = None
+        self._last_finish: Optional[float] = None
+        self._worker_actuals: Dict[int, float] = {}
+        # Worker side: serialized reports that count towards the summary, for the parent
+        self.reports: List[dict] = []
+
+    # -- planning ---------------------------------------------------------
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config: pytest.Config, items: List[pytest.Item]) -> None:
+        total = self.shard[1] if self.shard else self.workers
+        if total <= 1 or not items:
+            return
+        parallel = items
+        if self.workers > 1 or self.is_worker:
+            # Kept out of the worker plans; the parent runs them once the workers are done
+            self.serial_items = [item for item in items if item.get_closest_marker(SERIAL_MARKER)]
+            parallel = [item for item in items if not item.get_closest_marker(SERIAL_MARKER)]
+        units = build_units(parallel, self.store)
+        if not self.shard:
+            # Never start more worker processes than there are units to hand out
+            total = min(total, len(units))
+        self.plans = plan_schedule(units, total, self.store.fixtures)
+        if not self.shard:
+            return
+
+        selected_ids = set(self.plans[self.shard[0] - 1].nodeids)
+        selected = [item for item in items if item.nodeid in selected_ids]
+        deselected = [item for item in items if item.nodeid not in selected_ids]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+    # -- recording --------------------------------------------------------
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        start = time.perf_counter()
+        yield
+        if fixturedef.scope != "session" or self._current_nodeid is None:
+            return
+        elapsed = time.perf_counter() - start
+        self.observed_fixtures[fixturedef.argname] = elapsed
+        self._fixture_overhead[self._current_nodeid] = (
+            self._fixture_overhead.get(self._current_nodeid, 0.0) + elapsed
+        )
+
+    def pytest_runtest_logstart(self, nodeid: str, location) -> None:
+        self._current_nodeid = nodeid
+        if self._first_start is None:
+            self._first_start = time.perf_counter()
+
+    def pytest_runtest_logfinish(self, nodeid: str, location) -> None:
+        self._current_nodeid = None
+        self._last_finish = time.perf_counter()
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        duration = report.duration
+        if report.when == "setup":
+            # Session fixture setup is tracked on its own, not as part of the test
+            duration = max(0.0, duration - self._fixture_overhead.pop(report.nodeid, 0.0))
+        self.observed_tests[report.nodeid] = self.observed_tests.get(report.nodeid, 0.0) + duration
+        if self.output_path and self._summary_category(report):
+            self.reports.append(self.config.hook.pytest_report_to_serializable(config=self.config, report=report))
+
+    def _summary_category(self, report: pytest.TestReport) -> str:
+        """The terminal summary category (passed, failed, xfailed, ...) a report counts towards, or ''."""
+        return self.config.hook.pytest_report_teststatus(report=report, config=self.config)[0]
+
+    # -- parallel fan-out -------------------------------------------------
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session: pytest.Session) -> Optional[bool]:
+        if self.workers <= 1 or not self.plans or session.config.option.collectonly:
+            return None
+
+        # Shared state is prepared once here; workers skip it (see --scheduler-worker)
+        self.config.hook.pytest_scheduler_prepare_workers(config=self.config, items=session.items)
+
+        args = self._worker_args()
+        rootdir = str(self.config.invocation_params.dir)
+        total = len(self.plans)
+        procs = []
+        failed_workers = 0
+        worker_reports: List[pytest.TestReport] = []
+        with tempfile.TemporaryDirectory(prefix="scheduler-") as tmp:
+            for plan in self.plans:
+                output = os.path.join(tmp, f"worker{plan.index + 1}.json")
+                cmd = [sys.executable, "-m", "pytest", *args,
+                       "--shard", f"{plan.index + 1}/{total}", "--scheduler-output", output,
+                       "--scheduler-worker"]
+                if self.config.pluginmanager.hasplugin("html"):
+                    cmd.append(f"--html=report-worker{plan.index + 1}.html")
+                logger.info(f"Starting worker {plan.index + 1}/{total} "
+                            f"({len(plan.nodeids)} tests, predicted {plan.load:.2f}s)")
+                procs.append((plan, output, subprocess.Popen(
+                    cmd, cwd=rootdir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                )))
+
+            for plan, output, proc in procs:
+                log, _ = proc.communicate()
+                sys.stdout.write(f"\n{'=' * 20} worker {plan.index + 1}/{total} {'=' * 20}\n{log}")
+                # Exit code 5 means the worker had nothing to run
+                if proc.returncode not in (0, 5):
+                    failed_workers += 1
+                worker_reports.extend(self._merge_worker_output(plan.index, output))
+
+        # Count the workers' results in this process's summary, ahead of the serial tests
+        reporter = self.config.pluginmanager.get_plugin("terminalreporter")
+        for report in worker_reports if reporter is not None else []:
+            reporter.stats.setdefault(self._summary_category(report), []).append(report)
+
+        for i, item in enumerate(self.serial_items):
+            next_item = self.serial_items[i + 1] if i + 1 < len(self.serial_items) else None
+            item.config.hook.pytest_runtest_protocol(item=item, nextitem=next_item)
+            if session.shouldfail or session.shouldstop:
+                break
+        session.testsfailed += failed_workers
+        return True
+
+    def _worker_args(self) -> List[str]:
+        """Original command line minus --workers, re-run once per worker."""
+        args, skip = [], False
+        for arg in self.config.invocation_params.args:
+            if skip:
+                skip = False
+            elif arg == "--workers":
+                skip = True
+            elif not arg.startswith("--workers="):
+                args.append(arg)
+        return args
+
+    def _merge_worker_output(self, index: int, path: str) -> List[pytest.TestReport]:
+        """Fold a worker's observations in; returns its test reports."""
+        try:
+            with open(path, encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            logger.warning(f"Worker {index + 1} produced no duration output")
+            return []
+        self.observed_tests.update(data.get("tests", {}))
+        for name, seconds in data.get("fixtures", {}).items():
+            self.observed_fixtures[name] = max(seconds, self.observed_fixtures.get(name, 0.0))
+        self._worker_actuals[index] = data.get("wall", 0.0)
+        return [self.config.hook.pytest_report_from_serializable(config=self.config, data=report)
+                for report in data.get("reports", [])]
+
+    # -- persistence and reporting ----------------------------------------
+
+    @property
+    def wall_time(self) -> float:
+        if self._first_start is None or self._last_finish is None:
+            return 0.0
+        return self._last_finish - self._first_start
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if session.config.option.collectonly or not self.observed_tests:
+            return
+        if self.output_path:
+            # Worker processes hand their observations back to the parent
+            with open(self.output_path, "w", encoding="utf-8") as handle:
+                json.dump({"tests": self.observed_tests, "fixtures": self.observed_fixtures,
+                           "wall": self.wall_time, "reports": self.reports}, handle)
+            return
+        if self.shard:
+            # Every shard of a CI run must plan from the same snapshot, or shards
+            # run later would re-plan from updated timings and overlap or miss tests
+            logger.info(f"Shard run: {self.store.path} left unchanged "
+                        f"(pass --scheduler-output to keep this shard's timings for tools.merge_durations)")
+            return
+        self.store.update(self.observed_tests, self.observed_fixtures)
+        self.store.save()
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not self.plans or self.output_path:
+            return
+        terminalreporter.section("duration-aware scheduling")
+        if self.shard:
+            plan = self.plans[self.shard[0] - 1]
+            terminalreporter.write_line(
+                f"shard {self.shard[0]}/{self.shard[1]}: {len(plan.nodeids)} tests, "
+                f"predicted {plan.load:.2f}s, actual {self.wall_time:.2f}s"
+            )
+            return
+        if not self._worker_actuals:
+            return
+        for plan in self.plans:
+            terminalreporter.write_line(
+                f"worker {plan.index + 1}: {len(plan.nodeids)} tests, "
+                f"predicted {plan.load:.2f}s, actual {self._worker_actuals.get(plan.index, 0.0):.2f}s"
+            )
+        predicted = max(plan.load for plan in self.plans)
+        actual = max(self._worker_actuals.values())
+        terminalreporter.write_line(f"makespan: predicted {predicted:.2f}s, actual {actual:.2f}s")
+        if self.serial_items:
+            terminalreporter.write_line(f"serial: {len(self.serial_items)} tests run after the workers, "
+                                        f"actual {self.wall_time:.2f}s")
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("scheduling", "duration-aware test scheduling")
+    group.addoption(
+        "--shard", default=None, metavar="K/N",
+        help="Run only the K-th of N duration-balanced shards (1-based).",
+    )
+    group.addoption(
+        "--workers", type=int, default=1, metavar="N",
+        help="Run duration-balanced shards in N parallel worker processes.",
+    )
+    group.addoption(
+        "--durations-path", default=DEFAULT_DURATIONS_PATH,
+        help=f"JSON file holding historical test durations (default: {DEFAULT_DURATIONS_PATH}).",
+    )
+    group.addoption(
+        "--scheduler-output", default=None, metavar="PATH",
+        help="Write this run's observed durations to PATH instead of the durations file "
+             "(shard runs never update it; merge outputs with python -m tools.merge_durations).",
+    )
+    # Internal: set on worker processes, whose shared state the parent already prepared
+    group.addoption("--scheduler-worker", action="store_true", default=False, help=argparse.SUPPRESS)
+
+
+def pytest_addhooks(pluginmanager: pytest.PytestPluginManager) -> None:
+    from plugins import scheduler_hooks
+
+    pluginmanager.add_hookspecs(scheduler_hooks)
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.pluginmanager.register(DurationScheduler(config), "duration-scheduler")
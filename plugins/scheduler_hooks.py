@@ -0,0 +1,15 @@
+"""
+Hook specifications added by plugins/scheduler.py.
+"""
+from typing import List
+
+import pytest
+
+
+def pytest_scheduler_prepare_workers(config: pytest.Config, items: List[pytest.Item]) -> None:
+    """
+    Called once in the parent process of a ``--workers`` run, before any
+    worker starts, with every item the run will execute. Prepare state that
+    those items share (e.g. initialize the backend database); workers are
+    started with ``--scheduler-worker`` so session fixtures can skip that setup.
+    """
@@ -1 +1,25 @@
-# Identifies the services directory as a module
+# Identifies the services directory as a module.
+# Service classes are also exported lazily (PEP 562): `from services import AccountsService`
+# imports only services/accounts_service.py, and only on first access.
+import importlib
+
+_LAZY_EXPORTS = {
+    "BaseService": "services.base_service",
+    "AccountsService": "services.accounts_service",
+    "AdminService": "services.admin_service",
+    "AuthService": "services.auth_service",
+    "CustomersService": "services.customers_service",
+    "LoansService": "services.loans_service",
+    "PositionsService": "services.positions_service",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
@@ -1,8 +1,12 @@
-from requests import Response
+from __future__ import annotations
+
 from services.base_service import BaseService
 from models.account import Account
 from models.transaction import Transaction
-from typing import Optional, Tuple, List
+from typing import TYPE_CHECKING, Optional, Tuple, List
+
+if TYPE_CHECKING:
+    from requests import Response
 
 
 class AccountsService(BaseService):
@@ -15,6 +19,7 @@ class AccountsService(BaseService):
     # Endpoint constants for non-resource operations
     TRANSFER_ENDPOINT = "/transfer"
     WITHDRAW_ENDPOINT = "/withdraw"
+    DEPOSIT_ENDPOINT = "/deposit"
     CREATE_ACCOUNT_ENDPOINT = "/createAccount"
 
     def get_account(self, account_id: int) -> Tuple[Response, Optional[Account]]:
@@ -48,6 +53,17 @@ class AccountsService(BaseService):
         }
         return self.api_client.post(self.WITHDRAW_ENDPOINT, params=params)
 
+    def deposit(self, account_id: int, amount: float) -> Response:
+        """
+        POST /deposit
+        Deposits a specific amount into an account.
+        """
+        params = {
+            "accountId": account_id,
+            "amount": amount
+        }
+        return self.api_client.post(self.DEPOSIT_ENDPOINT, params=params)
+
     def create_account(self, customer_id: int, new_account_type: int, from_account_id: int) -> Tuple[Response, Optional[Account]]:
         """
         POST /createAccount
@@ -64,6 +80,14 @@ class AccountsService(BaseService):
             account = Account.model_validate(response.json())
         return response, account
 
+    def get_transactions(self, account_id: int) -> Tuple[Response, Optional[List[Transaction]]]:
+        """GET /accounts/{accountId}/transactions"""
+        response = self.api_client.get(f"{self.endpoint}/{account_id}/transactions")
+        transactions = None
+        if response.status_code == 200:
+            transactions = [Transaction.model_validate(tx) for tx in response.json()]
+        return response, transactions
+
     def get_transactions_by_date(self, account_id: int, from_date: str, to_date: str) -> Tuple[Response, Optional[List[Transaction]]]:
         """GET /accounts/{accountId}/transactions/fromDate/{fromDate}/toDate/{toDate}"""
         response = self.api_client.get(
@@ -1,5 +1,10 @@
-from requests import Response
+from __future__ import annotations
+
 from services.base_service import BaseService
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from requests import Response
 
 
 class AdminService(BaseService):
@@ -1,7 +1,11 @@
-from requests import Response
+from __future__ import annotations
+
 from services.base_service import BaseService
 from models.customer import Customer
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Optional, Tuple
+
+if TYPE_CHECKING:
+    from requests import Response
 
 
 class AuthService(BaseService):
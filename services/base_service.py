@@ -2,7 +2,12 @@
 Base service class providing common functionality for all API service objects.
 Implements the DRY principle by centralizing shared initialization logic.
 """
-from core.api_client import APIClient
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.api_client import APIClient
 
 
 class BaseService:
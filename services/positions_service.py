@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from services.base_service import BaseService
+from models.position import HistoryPoint, Position
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from requests import Response
+
+# Stays within the APIClient's default connection pool (10 per host)
+DEFAULT_HISTORY_WORKERS = 8
+# Parabank's path date format for position history windows
+HISTORY_DATE_FORMAT = "%m-%d-%Y"
+
+
+class PositionsService(BaseService):
+    """
+    Service Object for the Positions endpoints.
+    Encapsulates /positions, /customers/{customerId}/positions and the
+    buyPosition / sellPosition actions.
+    """
+    endpoint = "/positions"
+    CUSTOMERS_ENDPOINT = "/customers"
+
+    def get_positions(self, customer_id: int) -> Tuple[Response, Optional[List[Position]]]:
+        """GET /customers/{customerId}/positions"""
+        response = self.api_client.get(f"{self.CUSTOMERS_ENDPOINT}/{customer_id}/positions")
+        return response, self._positions(response)
+
+    def get_position(self, position_id: int) -> Tuple[Response, Optional[Position]]:
+        """GET /positions/{positionId}"""
+        response = self.api_client.get(f"{self.endpoint}/{position_id}")
+        position = None
+        if response.status_code == 200:
+            position = Position.model_validate(response.json())
+        return response, position
+
+    def get_position_history(self, position_id: int, start_date: str, end_date: str) -> Tuple[Response, Optional[List[HistoryPoint]]]:
+        """GET /positions/{positionId}/{startDate}/{endDate}"""
+        response = self.api_client.get(f"{self.endpoint}/{position_id}/{start_date}/{end_date}")
+        history = None
+        if response.status_code == 200:
+            history = [HistoryPoint.model_validate(point) for point in response.json()]
+        return response, history
+
+    def get_position_histories(self, position_ids: Iterable[int], start_date: str, end_date: str,
+                               max_workers: int = DEFAULT_HISTORY_WORKERS) -> Dict[int, Tuple[Response, Optional[List[HistoryPoint]]]]:
+        """
+        Fetch the same date window for many positions concurrently.
+        Returns {positionId: (response, history)} in the order given.
+        """
+        position_ids = list(position_ids)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = pool.map(lambda position_id: self.get_position_history(position_id, start_date, end_date),
+                               position_ids)
+            return dict(zip(position_ids, results))
+
+    def buy_position(self, customer_id: int, account_id: int, name: str, symbol: str, shares: int,
+                     price_per_share: float) -> Tuple[Response, Optional[List[Position]]]:
+        """
+        POST /customers/{customerId}/buyPosition
+        Buys shares funded from account_id; returns the customer's positions.
+        """
+        params = {
+            "accountId": account_id,
+            "name": name,
+            "symbol": symbol,
+            "shares": shares,
+            "pricePerShare": price_per_share
+        }
+        response = self.api_client.post(f"{self.CUSTOMERS_ENDPOINT}/{customer_id}/buyPosition", params=params)
+        return response, self._positions(response)
+
+    def sell_position(self, customer_id: int, account_id: int, position_id: int, shares: int,
+                      price_per_share: float) -> Tuple[Response, Optional[List[Position]]]:
+        """
+        POST /customers/{customerId}/sellPosition
+        Sells shares of a position into account_id; returns the customer's positions.
+        """
+        params = {
+            "accountId": account_id,
+            "positionId": position_id,
+            "shares": shares,
+            "pricePerShare": price_per_share
+        }
+        response = self.api_client.post(f"{self.CUSTOMERS_ENDPOINT}/{customer_id}/sellPosition", params=params)
+        return response, self._positions(response)
+
+    @staticmethod
+    def _positions(response: Response) -> Optional[List[Position]]:
+        if response.status_code != 200:
+            return None
+        return [Position.model_validate(position) for position in response.json()]
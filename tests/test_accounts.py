@@ -49,6 +49,72 @@ class TestAccounts:
         assert from_resp.status_code == 200
         assert to_resp.status_code == 200
 
+    def test_deposit_funds(self, accounts_service: AccountsService):
+        """
+        Test Objective: Verify that a deposit credits exactly the deposited amount.
+        Endpoint: POST /deposit
+        """
+        # Use a freshly created account so no other activity affects its balance
+        _, account = accounts_service.create_account(
+            customer_id=DEFAULT_CUSTOMER.ID,
+            new_account_type=ACCOUNT_DATA.NEW_ACCOUNT_TYPE_CHECKING,
+            from_account_id=ACCOUNT_DATA.DEFAULT_ID
+        )
+        assert account is not None, "Prerequisite failed: could not create account."
+
+        response = accounts_service.deposit(account.id, ACCOUNT_DATA.TRANSFER_AMOUNT)
+
+        assert response.status_code == 200, (
+            f"Deposit failed with status {response.status_code}"
+        )
+        _, updated = accounts_service.get_account(account.id)
+        assert updated is not None, "Failed to parse Account data"
+        assert updated.balance == pytest.approx(account.balance + ACCOUNT_DATA.TRANSFER_AMOUNT), (
+            f"Expected balance {account.balance + ACCOUNT_DATA.TRANSFER_AMOUNT}, got {updated.balance}"
+        )
+
+    def test_transfer_is_recorded_in_history(self, accounts_service: AccountsService):
+        """
+        Test Objective: Verify that a transfer credits the target account once
+        and appears in its transaction history.
+        Endpoints: POST /transfer, GET /accounts/{accountId}/transactions
+        """
+        _, target_account = accounts_service.create_account(
+            customer_id=DEFAULT_CUSTOMER.ID,
+            new_account_type=ACCOUNT_DATA.NEW_ACCOUNT_TYPE_CHECKING,
+            from_account_id=ACCOUNT_DATA.DEFAULT_ID
+        )
+        assert target_account is not None, "Prerequisite failed: could not create target account."
+        # The opening deposit is already in the history, so compare before/after
+        _, history_before = accounts_service.get_transactions(target_account.id)
+        assert history_before is not None, "Failed to parse Transactions data"
+
+        response = accounts_service.transfer(
+            ACCOUNT_DATA.DEFAULT_ID,
+            target_account.id,
+            ACCOUNT_DATA.TRANSFER_AMOUNT
+        )
+        assert response.status_code == 200, (
+            f"Transfer failed with status {response.status_code}"
+        )
+
+        _, updated = accounts_service.get_account(target_account.id)
+        assert updated is not None, "Failed to parse Account data"
+        assert updated.balance == pytest.approx(target_account.balance + ACCOUNT_DATA.TRANSFER_AMOUNT), (
+            "Target balance did not increase by exactly the transferred amount"
+        )
+
+        history_response, history_after = accounts_service.get_transactions(target_account.id)
+        assert history_response.status_code == 200, (
+            f"Transactions endpoint failed with status {history_response.status_code}"
+        )
+        assert history_after is not None, "Failed to parse Transactions data"
+        known_ids = {tx.id for tx in history_before}
+        new_entries = [tx for tx in history_after if tx.id not in known_ids]
+        assert len(new_entries) == 1, f"Expected exactly one new history entry, found {len(new_entries)}"
+        assert new_entries[0].type == "Credit"
+        assert new_entries[0].amount == pytest.approx(ACCOUNT_DATA.TRANSFER_AMOUNT)
+
     def test_withdraw_funds_boundary(self, accounts_service: AccountsService):
         """
         Test Objective: Check if the system correctly handles a withdrawal
@@ -6,6 +6,7 @@ from data.test_data import INVALID_DATA
 
 @pytest.mark.regression
 class TestAdministration:
+    @pytest.mark.serial
     def test_database_cleanup(self, admin_service: AdminService, customers_service: CustomersService):
         """
         Test Objective: Ensure the administrative function to reset the database works correctly.
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import pytest
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+from models.position import Position
+from services.positions_service import HISTORY_DATE_FORMAT, PositionsService
+from data.test_data import DEFAULT_CUSTOMER, ACCOUNT_DATA, POSITION_DATA
+
+if TYPE_CHECKING:
+    from core.history_cache import PriceHistoryCache
+
+
+@pytest.mark.regression
+class TestPositions:
+    @pytest.mark.smoke
+    def test_buy_position(self, positions_service: PositionsService):
+        """
+        Test Objective: Verify that buying shares creates a position for the customer.
+        Endpoint: POST /customers/{customerId}/buyPosition
+        """
+        response, positions = positions_service.buy_position(
+            customer_id=DEFAULT_CUSTOMER.ID,
+            account_id=ACCOUNT_DATA.DEFAULT_ID,
+            name=POSITION_DATA.NAME,
+            symbol=POSITION_DATA.SYMBOL,
+            shares=POSITION_DATA.SHARES,
+            price_per_share=POSITION_DATA.PRICE_PER_SHARE
+        )
+
+        assert response.status_code == 200, (
+            f"Buy Position failed with status {response.status_code}"
+        )
+        assert positions is not None, "Failed to parse Positions data"
+        assert any(p.symbol == POSITION_DATA.SYMBOL and p.customerId == DEFAULT_CUSTOMER.ID
+                   for p in positions), f"Expected a {POSITION_DATA.SYMBOL} position for the customer"
+
+    def test_get_customer_positions(self, positions_service: PositionsService, position: Position):
+        """
+        Test Objective: Ensure a customer's positions include a newly bought position.
+        Endpoint: GET /customers/{customerId}/positions
+        """
+        response, positions = positions_service.get_positions(DEFAULT_CUSTOMER.ID)
+
+        assert response.status_code == 200, (
+            f"Positions endpoint failed with status {response.status_code}"
+        )
+        assert positions is not None, "Failed to parse Positions data"
+        assert position.positionId in {p.positionId for p in positions}
+
+    def test_get_position_details(self, positions_service: PositionsService, position: Position):
+        """
+        Test Objective: Ensure the API returns the correct position for a specific ID.
+        Endpoint: GET /positions/{positionId}
+        """
+        response, fetched = positions_service.get_position(position.positionId)
+
+        assert response.status_code == 200, (
+            f"Expected 200 OK, got {response.status_code}"
+        )
+        assert fetched is not None, "Failed to parse Position data"
+        assert fetched.positionId == position.positionId
+        assert fetched.symbol == POSITION_DATA.SYMBOL
+        assert fetched.shares == POSITION_DATA.SHARES
+
+    def test_sell_part_of_position(self, positions_service: PositionsService, position: Position):
+        """
+        Test Objective: Verify that selling shares reduces the position accordingly.
+        Endpoint: POST /customers/{customerId}/sellPosition
+        """
+        response, positions = positions_service.sell_position(
+            customer_id=DEFAULT_CUSTOMER.ID,
+            account_id=ACCOUNT_DATA.DEFAULT_ID,
+            position_id=position.positionId,
+            shares=POSITION_DATA.SELL_SHARES,
+            price_per_share=POSITION_DATA.PRICE_PER_SHARE
+        )
+
+        assert response.status_code == 200, (
+            f"Sell Position failed with status {response.status_code}"
+        )
+        assert positions is not None, "Failed to parse Positions data"
+        remaining = next((p for p in positions if p.positionId == position.positionId), None)
+        assert remaining is not None, (
+            f"Position {position.positionId} missing from the positions returned after a partial sale"
+        )
+        assert remaining.shares == POSITION_DATA.SHARES - POSITION_DATA.SELL_SHARES
+
+    def test_get_position_history(self, positions_service: PositionsService, position: Position):
+        """
+        Test Objective: Ensure price history is returned within the requested date range.
+        Endpoint: GET /positions/{positionId}/{startDate}/{endDate}
+        """
+        response, history = positions_service.get_position_history(
+            position.positionId,
+            POSITION_DATA.HISTORY_FROM_DATE,
+            POSITION_DATA.HISTORY_TO_DATE
+        )
+
+        assert response.status_code == 200, (
+            f"Position history endpoint failed with status {response.status_code}"
+        )
+        assert history is not None, "Failed to parse HistoryPoint data"
+        assert all(point.closingPrice > 0 for point in history), "Expected positive closing prices"
+
+    def test_history_cache_fetches_only_missing_range(self, positions_service: PositionsService,
+                                                      history_cache: PriceHistoryCache, position: Position):
+        """
+        Test Objective: Extending a cached window requests only the uncovered
+        dates and returns the same prices as a direct fetch.
+        Endpoint: GET /positions/{positionId}/{startDate}/{endDate}
+        """
+        def to_date(value: str):
+            return datetime.strptime(value, HISTORY_DATE_FORMAT).date()
+
+        start = to_date(POSITION_DATA.HISTORY_FROM_DATE)
+        end = to_date(POSITION_DATA.HISTORY_TO_DATE)
+        extended_end = to_date(POSITION_DATA.HISTORY_EXTENDED_TO_DATE)
+
+        history_cache.window(position.positionId, start, end)
+        assert history_cache.missing(position.positionId, start, extended_end) == [
+            (end + timedelta(days=1), extended_end)
+        ]
+        _, prices = history_cache.window(position.positionId, start, extended_end)
+        history_cache.window(position.positionId, start, end)
+
+        assert history_cache.stats.requests == 2, (
+            f"Expected 2 history requests, made {history_cache.stats.requests}"
+        )
+        _, history = positions_service.get_position_history(
+            position.positionId,
+            POSITION_DATA.HISTORY_FROM_DATE,
+            POSITION_DATA.HISTORY_EXTENDED_TO_DATE
+        )
+        assert history is not None, "Failed to parse HistoryPoint data"
+        assert list(prices) == pytest.approx([point.closingPrice for point in history])
+
+    @pytest.mark.negative
+    def test_get_nonexistent_position(self, positions_service: PositionsService):
+        """
+        Negative: Requesting a non-existent position should return an error status.
+        """
+        response, position = positions_service.get_position(POSITION_DATA.INVALID_ID)
+
+        assert response.status_code in [400, 404], (
+            f"Expected 400/404 for invalid position, got {response.status_code}"
+        )
+        assert position is None, "Did not expect position data for an invalid ID"
+
+    @pytest.mark.negative
+    def test_sell_more_shares_than_held(self, positions_service: PositionsService, position: Position):
+        """
+        Negative: Selling more shares than the position holds should be rejected.
+        """
+        response, _ = positions_service.sell_position(
+            customer_id=DEFAULT_CUSTOMER.ID,
+            account_id=ACCOUNT_DATA.DEFAULT_ID,
+            position_id=position.positionId,
+            shares=POSITION_DATA.SHARES + 1,
+            price_per_share=POSITION_DATA.PRICE_PER_SHARE
+        )
+
+        assert response.status_code in [400, 404], (
+            f"Expected 400/404 when overselling, got {response.status_code}"
+        )
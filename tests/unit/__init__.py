@@ -0,0 +1 @@
+# This file acts as a module identifier for the unit tests directory.
@@ -0,0 +1,21 @@
+"""
+Unit tests for the framework's own building blocks (scheduler, cassettes,
+analytics, tools). They need no Parabank backend: tests that exercise HTTP
+run against an in-process stand-in server.
+"""
+import pytest
+from tools.stand_in import StandInServer
+
+
+@pytest.fixture(scope="session")
+def db_setup():
+    """Overrides the autouse database initialization: unit tests never touch the backend."""
+    yield
+
+
+@pytest.fixture(scope="module")
+def stand_in() -> StandInServer:
+    """An in-memory Parabank stand-in on a free local port."""
+    server = StandInServer().start()
+    yield server
+    server.stop()
@@ -0,0 +1,137 @@
+import os
+import pytest
+from core.api_client import APIClient
+from core.cassette import MAGIC, Cassette, MatchPolicy
+from core.exceptions import CassetteError, CassetteMissError
+from data.test_data import ACCOUNT_DATA, DEFAULT_CUSTOMER, INVALID_DATA, POSITION_DATA, TRANSACTION_DATES
+
+
+@pytest.fixture
+def cassette_path(tmp_path) -> str:
+    return str(tmp_path / "cassettes" / "parabank")
+
+
+def _client(base_url: str, cassette):
+    return APIClient(base_url=base_url, timeout=5, max_retries=0, cassette=cassette)
+
+
+def _record(stand_in, path: str, calls, policy=None) -> list:
+    """Record (method, endpoint, params) calls against the stand-in; returns the live responses."""
+    with Cassette(path, mode="record", policy=policy) as cassette:
+        client = _client(stand_in.base_url, cassette)
+        responses = [client.request(method, endpoint, params=params) for method, endpoint, params in calls]
+        client.session.close()
+    return responses
+
+
+def _replay(path: str, policy=None):
+    cassette = Cassette(path, mode="replay", policy=policy)
+    # Nothing listens here: a request that escapes the cassette fails loudly
+    return cassette, _client("http://127.0.0.1:9", cassette)
+
+
+class TestCassetteRoundTrip:
+    def test_replay_returns_recorded_responses(self, stand_in, cassette_path):
+        _record(stand_in, cassette_path, [
+            ("GET", f"/accounts/{ACCOUNT_DATA.DEFAULT_ID}", None),
+            ("GET", f"/accounts/{INVALID_DATA.ACCOUNT_ID}", None),
+        ])
+        cassette, client = _replay(cassette_path)
+        with cassette:
+            found = client.get(f"/accounts/{ACCOUNT_DATA.DEFAULT_ID}")
+            missing = client.get(f"/accounts/{INVALID_DATA.ACCOUNT_ID}")
+
+        assert found.status_code == 200
+        assert found.json()["id"] == ACCOUNT_DATA.DEFAULT_ID
+        assert missing.status_code == 400
+
+    def test_repeated_request_reuses_its_exact_recording(self, stand_in, cassette_path):
+        _record(stand_in, cassette_path, [
+            ("GET", f"/accounts/{ACCOUNT_DATA.DEFAULT_ID}", None),
+            ("GET", f"/accounts/{INVALID_DATA.ACCOUNT_ID}", None),
+        ])
+        cassette, client = _replay(cassette_path)
+        with cassette:
+            statuses = [client.get(f"/accounts/{ACCOUNT_DATA.DEFAULT_ID}").status_code for _ in range(3)]
+
+        assert statuses == [200, 200, 200], (
+            f"Replaying the same account must not fall through to another ID's recording, got {statuses}"
+        )
+
+    def test_ids_and_dates_are_templated(self, stand_in, cassette_path):
+        from_date, to_date = TRANSACTION_DATES.FROM_DATE, TRANSACTION_DATES.TO_DATE
+        _record(stand_in, cassette_path, [
+            ("GET", f"/accounts/{ACCOUNT_DATA.DEFAULT_ID}", None),
+            ("GET", f"/accounts/{ACCOUNT_DATA.DEFAULT_ID}/transactions/fromDate/{from_date}/toDate/{to_date}", None),
+        ])
+        cassette, client = _replay(cassette_path)
+        with cassette:
+            account = client.get(f"/accounts/{ACCOUNT_DATA.SECONDARY_ID}")
+            history = client.get(f"/accounts/{ACCOUNT_DATA.SECONDARY_ID}/transactions/fromDate/02-01-2024/toDate/02-29-2024")
+
+        assert account.status_code == 200
+        assert account.json()["id"] == ACCOUNT_DATA.DEFAULT_ID, "Expected the templated recording to be served"
+        assert history.status_code == 200
+
+    def test_untemplated_policy_requires_exact_ids(self, stand_in, cassette_path):
+        policy = MatchPolicy(template_ids=False)
+        _record(stand_in, cassette_path, [("GET", f"/accounts/{ACCOUNT_DATA.DEFAULT_ID}", None)], policy)
+        cassette, client = _replay(cassette_path, policy)
+        with cassette, pytest.raises(CassetteMissError):
+            client.get(f"/accounts/{ACCOUNT_DATA.SECONDARY_ID}")
+
+    def test_volatile_params_match_by_name(self, stand_in, cassette_path):
+        recorded = {"customerId": DEFAULT_CUSTOMER.ID, "newAccountType": 0, "fromAccountId": ACCOUNT_DATA.DEFAULT_ID}
+        replayed = dict(recorded, fromAccountId=ACCOUNT_DATA.SECONDARY_ID)
+        _record(stand_in, cassette_path, [("POST", "/createAccount", recorded)])
+
+        strict, client = _replay(cassette_path)
+        with strict, pytest.raises(CassetteMissError):
+            client.post("/createAccount", params=replayed)
+
+        lenient, client = _replay(cassette_path, MatchPolicy(volatile_params=frozenset({"fromAccountId"})))
+        with lenient:
+            response = client.post("/createAccount", params=replayed)
+        assert response.status_code == 200
+
+    def test_blank_params_replay(self, stand_in, cassette_path):
+        params = {"accountId": ACCOUNT_DATA.DEFAULT_ID, "name": "", "symbol": POSITION_DATA.SYMBOL,
+                  "shares": POSITION_DATA.SHARES, "pricePerShare": POSITION_DATA.PRICE_PER_SHARE}
+        endpoint = f"/customers/{DEFAULT_CUSTOMER.ID}/buyPosition"
+        recorded, = _record(stand_in, cassette_path, [("POST", endpoint, params)])
+        cassette, client = _replay(cassette_path)
+        with cassette:
+            replayed = client.post(endpoint, params=params)
+
+        assert (replayed.status_code, replayed.content) == (recorded.status_code, recorded.content)
+
+    def test_exhausted_recordings_serve_the_latest(self, stand_in, cassette_path):
+        _record(stand_in, cassette_path, [
+            ("GET", f"/accounts/{ACCOUNT_DATA.DEFAULT_ID}", None),
+            ("GET", f"/accounts/{ACCOUNT_DATA.SECONDARY_ID}", None),
+        ])
+        cassette, client = _replay(cassette_path)
+        with cassette:
+            ids = [client.get("/accounts/20000").json()["id"] for _ in range(3)]
+
+        assert ids == [ACCOUNT_DATA.DEFAULT_ID, ACCOUNT_DATA.SECONDARY_ID, ACCOUNT_DATA.SECONDARY_ID]
+
+    def test_unrecorded_request_is_a_miss(self, stand_in, cassette_path):
+        _record(stand_in, cassette_path, [("GET", f"/accounts/{ACCOUNT_DATA.DEFAULT_ID}", None)])
+        cassette, client = _replay(cassette_path)
+        with cassette, pytest.raises(CassetteMissError):
+            client.get(f"/customers/{DEFAULT_CUSTOMER.ID}")
+
+    def test_missing_cassette_is_reported(self, cassette_path):
+        with pytest.raises(CassetteError, match="record it first"):
+            _replay(cassette_path)
+
+    def test_empty_data_file_is_reported(self, stand_in, cassette_path):
+        _record(stand_in, cassette_path, [("GET", f"/accounts/{ACCOUNT_DATA.DEFAULT_ID}", None)])
+        with open(f"{cassette_path}.cassette", "wb") as handle:
+            handle.write(MAGIC)
+        assert os.path.getsize(f"{cassette_path}.cassette.idx") > 0
+
+        cassette, client = _replay(cassette_path)
+        with cassette, pytest.raises(CassetteError, match="empty or truncated"):
+            client.get(f"/accounts/{ACCOUNT_DATA.DEFAULT_ID}")
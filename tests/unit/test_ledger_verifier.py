@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+from tools.ledger_verifier import (BASE_AMOUNT_CENTS, OP_DEPOSIT, OP_TRANSFER, OP_WITHDRAW, STATUS_ACKED,
+                                   STATUS_REJECTED, Workload, analyze, next_in_group_min)
+
+# Pool indexes of the three synthetic accounts
+A, B, C = 0, 1, 2
+OPENING_CENTS = 100_000
+
+
+@pytest.fixture
+def workload():
+    """
+    Five sequential operations (each acknowledged before the next is sent):
+    0 transfer A->B, 1 withdraw C, 2 deposit B (rejected), 3 transfer B->C, 4 deposit A.
+    """
+    ops = np.arange(5, dtype=np.int64)
+    return Workload(
+        kind=np.array([OP_TRANSFER, OP_WITHDRAW, OP_DEPOSIT, OP_TRANSFER, OP_DEPOSIT], dtype=np.int8),
+        account=np.array([A, C, B, B, A], dtype=np.int64),
+        counterparty=np.array([B, -1, -1, C, -1], dtype=np.int64),
+        amount_cents=BASE_AMOUNT_CENTS + ops,
+        sent_ns=ops * 1000,
+        acked_ns=ops * 1000 + 500,
+        status=np.array([STATUS_ACKED, STATUS_ACKED, STATUS_REJECTED, STATUS_ACKED, STATUS_ACKED], dtype=np.int8),
+    )
+
+
+# (operation, pool index, sign) history entries the workload above should leave, in server order
+CLEAN_HISTORY = [(0, A, -1), (0, B, 1), (1, C, -1), (3, B, -1), (3, C, 1), (4, A, 1)]
+
+
+def _analyze(workload, history, balance_errors=None):
+    """
+    Run analyze() on history entries given in server order (transaction ids
+    1, 2, ...); balance_errors maps pool indexes to cents off their closing balance.
+    """
+    opening = np.full(3, OPENING_CENTS, dtype=np.int64)
+    closing = opening.copy()
+    for op, account, sign in CLEAN_HISTORY:
+        closing[account] += sign * (BASE_AMOUNT_CENTS + op)
+    for account, cents in (balance_errors or {}).items():
+        closing[account] += cents
+    hist_account = np.array([account for _, account, _ in history], dtype=np.int64)
+    hist_id = np.arange(1, len(history) + 1, dtype=np.int64)
+    hist_cents = np.array([sign * (BASE_AMOUNT_CENTS + op) for op, _, sign in history], dtype=np.int64)
+    return analyze(workload, opening, closing, hist_account, hist_id, hist_cents, load_seconds=1.0)
+
+
+class TestAnalyze:
+    def test_consistent_history_has_no_anomalies(self, workload):
+        report = _analyze(workload, CLEAN_HISTORY)
+
+        assert report.anomalies == {}, f"Unexpected anomalies: {report.anomalies}"
+        assert (report.acknowledged, report.rejected) == (4, 1)
+        assert report.conserved
+
+    def test_lost_update(self, workload):
+        report = _analyze(workload, [e for e in CLEAN_HISTORY if e[0] != 4])
+
+        assert report.lost_updates == 1
+        assert report.balance_mismatches == 0  # the balance moved, the history does not show it
+        assert report.running_balance_violations == 1
+
+    def test_overwritten_balance_is_a_lost_update(self, workload):
+        # Both deposits to A are in its history, but a racing write dropped operation 4's credit
+        report = _analyze(workload, CLEAN_HISTORY, balance_errors={A: -(BASE_AMOUNT_CENTS + 4)})
+
+        assert report.lost_updates == 1
+        assert report.balance_mismatches == 1
+        assert report.running_balance_violations == 1
+
+    def test_duplicate_entry(self, workload):
+        report = _analyze(workload, CLEAN_HISTORY + [(1, C, -1)])
+
+        assert report.duplicate_entries == 1
+        assert report.lost_updates == 0
+
+    def test_misrouted_entry(self, workload):
+        history = [(1, A, -1) if entry == (1, C, -1) else entry for entry in CLEAN_HISTORY]
+        report = _analyze(workload, history)
+
+        assert report.misrouted_entries == 1
+        assert report.lost_updates == 1
+
+    def test_phantom_entry_from_rejected_operation(self, workload):
+        report = _analyze(workload, CLEAN_HISTORY + [(2, B, 1)])
+
+        assert report.phantom_entries == 1
+        assert report.misrouted_entries == 0
+
+    def test_torn_transfer(self, workload):
+        report = _analyze(workload, [e for e in CLEAN_HISTORY if e != (0, B, 1)])
+
+        assert report.torn_transfers == 1
+        assert report.lost_updates == 1
+
+    def test_ordering_anomaly(self, workload):
+        # On B, operation 3 is ordered before operation 0, although 0 was
+        # acknowledged before 3 was sent
+        history = [(0, A, -1), (3, B, -1), (0, B, 1), (1, C, -1), (3, C, 1), (4, A, 1)]
+        report = _analyze(workload, history)
+
+        assert report.ordering_anomalies == 1
+        assert report.anomalies == {"ordering_anomalies": 1}
+
+
+class TestNextInGroupMin:
+    def test_minimum_after_each_position_within_its_group(self):
+        none = np.iinfo(np.int64).max
+        group = np.array([0, 0, 0, 1, 1], dtype=np.int64)
+        values = np.array([5, 3, 4, 9, 1], dtype=np.int64)
+
+        assert next_in_group_min(group, values).tolist() == [3, 4, none, 1, none]
+
+    def test_empty_input(self):
+        assert len(next_in_group_min(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))) == 0
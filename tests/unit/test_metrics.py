@@ -0,0 +1,36 @@
+from core.metrics import LatencyRecorder
+from plugins.multi_target import _shorten
+
+
+class TestEndpointKey:
+    def test_ids_and_dates_are_templated(self):
+        assert LatencyRecorder.endpoint_key("get", "/accounts/12345") == "GET /accounts/{id}"
+        key = LatencyRecorder.endpoint_key("GET", "/accounts/13344/transactions/fromDate/01-01-2024/toDate/12-31-2024")
+        assert key == "GET /accounts/{id}/transactions/fromDate/{date}/toDate/{date}"
+
+    def test_login_credentials_are_templated(self):
+        key = LatencyRecorder.endpoint_key("GET", "/login/john/demo")
+
+        assert key == "GET /login/{username}/{password}"
+        assert "demo" not in key
+
+    def test_logins_aggregate_under_one_key(self):
+        recorder = LatencyRecorder()
+        recorder.record("GET", "/login/john/demo", 200, 5.0)
+        recorder.record("GET", "/login/invalid_user/wrong", 400, 7.0)
+
+        assert list(recorder.summary()) == ["GET /login/{username}/{password}"]
+        assert recorder.summary()["GET /login/{username}/{password}"]["count"] == 2
+
+
+class TestShorten:
+    def test_short_text_is_unchanged(self):
+        assert _shorten("tests/test_auth.py::test_login", 40) == "tests/test_auth.py::test_login"
+
+    def test_long_text_is_truncated_visibly(self):
+        text = "tests/test_accounts.py::TestAccounts::test_get_account_details"
+        shortened = _shorten(text, 30)
+
+        assert len(shortened) == 30
+        assert shortened.startswith("...")
+        assert text.endswith(shortened[3:])
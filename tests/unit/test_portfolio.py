@@ -0,0 +1,71 @@
+import math
+import numpy as np
+import pytest
+from core.portfolio import analyze_portfolio, build_price_matrix, forward_fill
+
+NAN = float("nan")
+
+
+def _matrix(windows):
+    """Build a PriceMatrix from {position id: (day ordinals, prices)} lists."""
+    return build_price_matrix({
+        position_id: (np.array(days, dtype=np.int64), np.array(prices, dtype=float))
+        for position_id, (days, prices) in windows.items()
+    })
+
+
+def _rows(array):
+    """Nested lists with NaN replaced by None, so arrays compare with ==."""
+    return [[None if math.isnan(v) else v for v in row] for row in array.tolist()]
+
+
+class TestForwardFill:
+    def test_gaps_carry_the_last_quote_and_leading_nans_stay(self):
+        values = np.array([[NAN, 1.0], [2.0, NAN], [NAN, NAN], [NAN, 3.0]])
+
+        assert _rows(forward_fill(values)) == [[None, 1.0], [2.0, 1.0], [2.0, 1.0], [2.0, 3.0]]
+
+
+class TestBuildPriceMatrix:
+    def test_windows_are_aligned_on_the_union_of_days(self):
+        matrix = _matrix({1: ([1, 2, 4], [10.0, 11.0, 9.0]), 2: ([3, 4], [5.0, 6.0])})
+
+        assert matrix.days.tolist() == [1, 2, 3, 4]
+        assert matrix.position_ids.tolist() == [1, 2]
+        # Position 2 has no quote before day 3: its column starts with NaN
+        assert _rows(matrix.prices) == [[10.0, None], [11.0, None], [11.0, 5.0], [9.0, 6.0]]
+
+
+class TestAnalyzePortfolio:
+    def test_valuation_returns_and_drawdowns(self):
+        matrix = _matrix({1: ([1, 2, 4], [10.0, 11.0, 9.0]), 2: ([3, 4], [5.0, 6.0])})
+        analytics = analyze_portfolio(matrix, shares=[1, 2], purchase_prices=[10.0, 4.0])
+
+        # Position 2 is valued at its purchase price until its first quote
+        assert analytics.values.tolist() == [18.0, 19.0, 21.0, 21.0]
+        assert analytics.cost_basis == 18.0
+        assert analytics.unrealized_pnl == 3.0
+        assert analytics.daily_returns.tolist() == pytest.approx([19 / 18 - 1, 21 / 19 - 1, 0.0])
+        assert analytics.cumulative_returns.tolist() == pytest.approx([0.0, 1 / 18, 3 / 18, 3 / 18])
+        assert analytics.max_drawdown == 0.0
+        assert analytics.position_returns.tolist() == pytest.approx([-0.1, 0.5])
+        assert analytics.position_max_drawdowns.tolist() == pytest.approx([9 / 11 - 1, 0.0])
+
+    def test_drawdown_from_running_peak(self):
+        matrix = _matrix({1: ([1, 2, 3, 4], [10.0, 12.0, 9.0, 11.0])})
+        analytics = analyze_portfolio(matrix, shares=[1], purchase_prices=[10.0])
+
+        assert analytics.drawdowns.tolist() == pytest.approx([0.0, 0.0, -0.25, 11 / 12 - 1])
+        assert analytics.max_drawdown == pytest.approx(-0.25)
+
+    def test_single_day_window(self):
+        matrix = _matrix({7: ([100], [50.0])})
+        analytics = analyze_portfolio(matrix, shares=[2], purchase_prices=[40.0])
+
+        assert analytics.values.tolist() == [100.0]
+        assert analytics.daily_returns.tolist() == []
+        assert analytics.cumulative_returns.tolist() == [0.0]
+        assert analytics.max_drawdown == 0.0
+        assert analytics.unrealized_pnl == 20.0
+        assert analytics.position_returns.tolist() == [0.0]
+        assert analytics.position_max_drawdowns.tolist() == [0.0]
@@ -0,0 +1,178 @@
+import os
+import random
+import re
+import subprocess
+import sys
+import pytest
+from types import SimpleNamespace
+from plugins.scheduler import DurationStore, WorkUnit, build_units, parse_shard, plan_schedule
+from tools.merge_durations import merge_durations
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Uneven, distinct durations so that recorded timings reshuffle an LPT plan
+SAMPLE_TESTS = "\n".join(
+    f"def test_{i}():\n    __import__('time').sleep({(i * 7 % 16) / 400})\n" for i in range(16)
+)
+
+
+class _Case:
+    """Stand-in for a collected test class."""
+
+
+def _item(nodeid: str, cls=None, **fixture_scopes: str):
+    """Minimal object with the attributes build_units reads from a pytest.Item."""
+    fixturedefs = {name: [SimpleNamespace(scope=scope)] for name, scope in fixture_scopes.items()}
+    return SimpleNamespace(nodeid=nodeid, cls=cls, _fixtureinfo=SimpleNamespace(name2fixturedefs=fixturedefs))
+
+
+def _store(tmp_path, durations=None) -> DurationStore:
+    store = DurationStore(str(tmp_path / "durations.json"))
+    store.tests = dict(durations or {})
+    return store
+
+
+class TestParseShard:
+    def test_valid_spec(self):
+        assert parse_shard("3/8") == (3, 8)
+        assert parse_shard("1/1") == (1, 1)
+
+    @pytest.mark.parametrize("value", ["3", "a/b", "1/2/3", "0/4", "5/4", "1/0", "-1/4"])
+    def test_invalid_spec_is_a_usage_error(self, value: str):
+        with pytest.raises(pytest.UsageError):
+            parse_shard(value)
+
+
+class TestBuildUnits:
+    def test_function_scoped_tests_are_separate_units(self, tmp_path):
+        store = _store(tmp_path, {"t.py::a": 2.0, "t.py::b": 3.0})
+        units = build_units([_item("t.py::a", api="function"), _item("t.py::b")], store)
+
+        assert [(u.key, u.nodeids, u.duration) for u in units] == [
+            ("t.py::a", ["t.py::a"], 2.0),
+            ("t.py::b", ["t.py::b"], 3.0),
+        ]
+
+    def test_shared_fixture_scopes_group_tests(self, tmp_path):
+        items = [
+            _item("pkg/t.py::C::a", cls=_Case, client="class"),
+            _item("pkg/t.py::C::b", cls=_Case, client="class"),
+            _item("pkg/m.py::a", data="module"),
+            _item("pkg/m.py::b", data="module"),
+            _item("pkg/p.py::a", env="package"),
+        ]
+        units = build_units(items, _store(tmp_path))
+
+        assert [u.key for u in units] == ["pkg/t.py::_Case", "pkg/m.py", "pkg"]
+        assert units[0].nodeids == ["pkg/t.py::C::a", "pkg/t.py::C::b"]
+
+    def test_unseen_tests_cost_the_mean_of_known_tests(self, tmp_path):
+        store = _store(tmp_path, {"t.py::a": 1.0, "t.py::b": 3.0})
+        units = build_units([_item("t.py::new")], store)
+
+        assert units[0].duration == 2.0
+
+    def test_session_fixtures_are_collected_per_unit(self, tmp_path):
+        items = [_item("t.py::a", data="module", db_setup="session"), _item("t.py::b", data="module", api="session")]
+        units = build_units(items, _store(tmp_path))
+
+        assert units[0].session_fixtures == frozenset({"db_setup", "api"})
+
+
+class TestPlanSchedule:
+    def test_longest_processing_time_first(self):
+        units = [WorkUnit(f"u{d}{i}", [f"t::{d}{i}"], float(d)) for i, d in enumerate([5, 4, 3, 3, 2, 2, 1])]
+        plans = plan_schedule(units, 2, {})
+
+        # 5 -> w0, 4 -> w1, 3 -> w1 (4 < 5), 3 -> w0, 2 -> w1, 2 -> w0, 1 -> w1
+        assert [[u.duration for u in plan.units] for plan in plans] == [[5, 3, 2], [4, 3, 2, 1]]
+        assert [plan.load for plan in plans] == [10.0, 10.0]
+
+    def test_session_fixture_cost_is_charged_once_per_worker(self):
+        units = [WorkUnit(f"u{i}", [f"t::{i}"], 1.0, frozenset({"db_setup"})) for i in range(4)]
+        plans = plan_schedule(units, 2, {"db_setup": 10.0})
+
+        assert [len(plan.units) for plan in plans] == [2, 2]
+        assert [plan.load for plan in plans] == [12.0, 12.0]
+
+    def test_fixture_cost_favours_workers_that_already_paid_it(self):
+        units = [
+            WorkUnit("plain", ["t::1"], 10.5),
+            WorkUnit("needs-db-1", ["t::2"], 1.0, frozenset({"db_setup"})),
+            WorkUnit("needs-db-2", ["t::3"], 0.9, frozenset({"db_setup"})),
+        ]
+        plans = plan_schedule(units, 2, {"db_setup": 10.0})
+
+        # needs-db-2 finishes at 11.9 on the worker that already set up db_setup,
+        # versus 21.4 on the other one, which would still have to pay for it
+        assert [u.key for u in plans[0].units] == ["plain"]
+        assert [u.key for u in plans[1].units] == ["needs-db-1", "needs-db-2"]
+        assert plans[1].load == pytest.approx(11.9)
+
+    def test_same_input_gives_same_plan(self):
+        units = [WorkUnit(f"u{i}", [f"t::{i}"], float(i % 3 + 1)) for i in range(20)]
+        shuffled = units[:]
+        random.Random(7).shuffle(shuffled)
+
+        first = [plan.nodeids for plan in plan_schedule(units, 4, {})]
+        assert [plan.nodeids for plan in plan_schedule(units, 4, {})] == first
+        # Ties break on unit key, so collection order does not matter either
+        assert [plan.nodeids for plan in plan_schedule(shuffled, 4, {})] == first
+
+
+def _run_pytest(directory, *args: str) -> subprocess.CompletedProcess:
+    """Run pytest with only the scheduler plugin on test_sample.py in directory."""
+    return subprocess.run(
+        [sys.executable, "-m", "pytest", "-p", "plugins.scheduler", "-p", "no:cacheprovider", "-q",
+         "--durations-path", "durations.json", *args, "test_sample.py"],
+        cwd=directory, capture_output=True, text=True, env={**os.environ, "PYTHONPATH": ROOT},
+    )
+
+
+def _run_shard(directory, shard: str, *args: str) -> list:
+    """Run one shard of SAMPLE_TESTS; returns the tests it ran."""
+    proc = _run_pytest(directory, "-rA", "--shard", shard, *args)
+    assert proc.returncode == 0, proc.stdout[-2000:]
+    return re.findall(r"^PASSED (\S+)", proc.stdout, re.MULTILINE)
+
+
+class TestShardRuns:
+    def test_consecutive_shards_partition_the_suite(self, tmp_path):
+        (tmp_path / "test_sample.py").write_text(SAMPLE_TESTS)
+        ran = [_run_shard(tmp_path, f"{k}/3") for k in (1, 2, 3)]
+
+        everything = [nodeid for shard in ran for nodeid in shard]
+        assert sorted(everything) == sorted(f"test_sample.py::test_{i}" for i in range(16)), (
+            f"Shards overlapped or missed tests: {ran}"
+        )
+        assert not (tmp_path / "durations.json").exists(), "Shard runs must not update the durations file"
+
+    def test_shard_outputs_merge_into_the_durations_file(self, tmp_path):
+        (tmp_path / "test_sample.py").write_text(SAMPLE_TESTS)
+        outputs = [str(tmp_path / f"shard-{k}.json") for k in (1, 2)]
+        for k, output in enumerate(outputs, start=1):
+            _run_shard(tmp_path, f"{k}/2", "--scheduler-output", output)
+
+        store = merge_durations(str(tmp_path / "durations.json"), outputs)
+
+        assert sorted(store.tests) == sorted(f"test_sample.py::test_{i}" for i in range(16))
+        assert DurationStore(str(tmp_path / "durations.json")).tests == store.tests
+
+
+class TestWorkerRuns:
+    def test_parent_summary_counts_worker_results(self, tmp_path):
+        (tmp_path / "test_sample.py").write_text(
+            "import pytest\n"
+            "def test_pass(): pass\n"
+            "def test_fail(): assert False\n"
+            "@pytest.mark.xfail\n"
+            "def test_xfail(): assert False\n"
+            "def test_skip(): pytest.skip('not here')\n"
+        )
+        proc = _run_pytest(tmp_path, "--workers", "2")
+
+        assert proc.returncode == 1, proc.stdout[-2000:]
+        summary = proc.stdout.strip().splitlines()[-1]
+        assert re.match(r"1 failed, 1 passed, 1 skipped, 1 xfailed in ", summary), (
+            f"Expected the workers' results in the final summary, got {summary!r}"
+        )
+        assert "FAILED test_sample.py::test_fail" in proc.stdout
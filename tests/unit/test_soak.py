@@ -0,0 +1,80 @@
+import argparse
+import pytest
+from data.test_data import ACCOUNT_DATA
+from tools.soak import Sample, Services, SoakRunner, parse_duration, parse_mix, pool_state, slope
+
+
+def _runner(warmup_s: float = 0.0) -> SoakRunner:
+    return SoakRunner(services=None, mix={"login": 1}, duration_s=60, interval_s=5, warmup_s=warmup_s)
+
+
+def _sample(elapsed_s: float, traced_bytes: int, open_fds=None) -> Sample:
+    return Sample(elapsed_s, iterations=0, errors=0, traced_bytes=traced_bytes, open_fds=open_fds,
+                  open_sockets=None, pools=1, opened_connections=1)
+
+
+class TestParseDuration:
+    @pytest.mark.parametrize("value, seconds", [("90", 90), ("45s", 45), ("1.5m", 90), ("4h", 14400), (" 2m ", 120)])
+    def test_units(self, value: str, seconds: float):
+        assert parse_duration(value) == seconds
+
+    @pytest.mark.parametrize("value", ["", "m", "10d", "-5s", "1h30m"])
+    def test_invalid(self, value: str):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_duration(value)
+
+
+class TestParseMix:
+    def test_weights_default_to_one(self):
+        assert parse_mix("login=2, get_account") == {"login": 2.0, "get_account": 1.0}
+
+    def test_unknown_scenario(self):
+        with pytest.raises(argparse.ArgumentTypeError, match="Unknown scenario"):
+            parse_mix("login=1,format_disk=3")
+
+
+class TestSlope:
+    def test_linear_series(self):
+        assert slope([(0, 10), (1, 12), (2, 14), (3, 16)]) == pytest.approx(2.0)
+
+    def test_noise_is_averaged_out(self):
+        assert slope([(0, 0), (1, 3), (2, 1), (3, 4)]) == pytest.approx(1.0)
+
+    @pytest.mark.parametrize("points", [[], [(0, 5)], [(4, 1), (4, 9)]])
+    def test_degenerate_series_have_no_slope(self, points):
+        assert slope(points) == 0.0
+
+
+class TestTrend:
+    def test_projects_growth_across_the_post_warmup_window(self):
+        runner = _runner(warmup_s=10)
+        # A large warm-up spike that must not count towards the trend
+        runner.samples = [_sample(0, 0), _sample(5, 50_000)] + [_sample(t, 1_000 + 10 * t) for t in (10, 20, 30, 40)]
+
+        assert runner.trend("traced_bytes") == pytest.approx(300.0)
+
+    def test_too_few_samples_after_warmup(self):
+        runner = _runner(warmup_s=30)
+        runner.samples = [_sample(t, t) for t in (0, 10, 20, 30, 40)]
+
+        assert runner.trend("traced_bytes") is None
+
+    def test_unavailable_series_is_skipped(self):
+        runner = _runner()
+        runner.samples = [_sample(t, t) for t in (0, 10, 20, 30)]
+
+        assert runner.trend("open_fds") is None
+
+
+class TestPoolState:
+    def test_one_host_one_connection(self, stand_in):
+        services = Services(stand_in.base_url, timeout=5)
+        try:
+            assert pool_state(services) == (0, 0)
+            for _ in range(3):
+                services.accounts.get_account(ACCOUNT_DATA.DEFAULT_ID)
+
+            # Keep-alive reuses the one connection; the shared http/https adapter counts once
+            assert pool_state(services) == (1, 1)
+        finally:
+            services.close()
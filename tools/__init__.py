@@ -0,0 +1 @@
+# Identifies the tools directory as a Python package.
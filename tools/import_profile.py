@@ -0,0 +1,139 @@
+"""
+Import-time profile of test collection, checked against a startup budget.
+
+Runs ``pytest --collect-only`` under ``python -X importtime`` (over the API
+suite, leaving out the framework's unit tests in tests/unit unless paths are
+given) and reports:
+  - the import cost attributable to this project (project modules plus
+    every third-party module they pulled in first),
+  - a per-package breakdown of self time,
+  - the slowest individual imports by cumulative time.
+
+Exits with status 1 when the project-attributable import time exceeds the
+budget, so it can gate CI.
+
+Usage:
+    python -m tools.import_profile [--budget-ms 200] [--top 15] [pytest args...]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Set
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET_MS = 200.0
+# The framework's own unit tests are not part of the API suite's startup
+EXCLUDED_TESTS = os.path.join("tests", "unit")
+LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)$")
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+    @property
+    def package(self) -> str:
+        return self.module.split(".")[0]
+
+
+def project_packages(root: str = ROOT) -> Set[str]:
+    """Top-level packages and modules that belong to this repository."""
+    names = {"conftest"}
+    for entry in os.listdir(root):
+        if os.path.isfile(os.path.join(root, entry, "__init__.py")):
+            names.add(entry)
+    return names
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    records = []
+    for line in stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            # importtime indents nested imports by two spaces per level
+            records.append(ImportRecord(module, (len(indent) - 1) // 2, int(self_us), int(cumulative_us)))
+    return records
+
+
+def attributable_us(records: List[ImportRecord], packages: Set[str]) -> int:
+    """
+    Sum the cumulative time of project imports not nested in another project
+    import. importtime prints children before parents, so walking the lines in
+    reverse visits each parent before its children.
+    """
+    total = 0
+    stack: List[tuple] = []  # (depth, inside_project)
+    for record in reversed(records):
+        while stack and stack[-1][0] >= record.depth:
+            stack.pop()
+        inside = bool(stack) and stack[-1][1]
+        is_project = record.package in packages
+        if is_project and not inside:
+            total += record.cumulative_us
+        stack.append((record.depth, inside or is_project))
+    return total
+
+
+def run_collection(pytest_args: List[str]) -> tuple:
+    if not any(os.path.exists(os.path.join(ROOT, arg.split("::")[0])) for arg in pytest_args):
+        # Profiling the default testpaths: measure the API suite only
+        pytest_args = [f"--ignore={EXCLUDED_TESTS}", *pytest_args]
+    with tempfile.TemporaryDirectory() as scratch:
+        # pytest-html stays loaded (it is part of every real run), but its
+        # report goes to a scratch file instead of overwriting report.html
+        cmd = [sys.executable, "-X", "importtime", "-m", "pytest", "--collect-only", "-q",
+               "-p", "no:cacheprovider", f"--html={os.path.join(scratch, 'report.html')}", *pytest_args]
+        start = time.perf_counter()
+        proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+        wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode not in (0, 5):
+        sys.stderr.write(proc.stdout[-2000:])
+        raise SystemExit(f"pytest --collect-only failed with exit code {proc.returncode}")
+    return proc.stderr, wall_ms
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"Max project-attributable import time (default: {DEFAULT_BUDGET_MS:.0f}ms)")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    args, pytest_args = parser.parse_known_args(argv)
+
+    stderr, wall_ms = run_collection(pytest_args)
+    records = parse_importtime(stderr)
+    packages = project_packages()
+
+    by_package: Dict[str, int] = defaultdict(int)
+    for record in records:
+        by_package[record.package] += record.self_us
+    total_us = sum(by_package.values())
+    project_us = attributable_us(records, packages)
+
+    print(f"Collection wall time: {wall_ms:.0f}ms, total import time: {total_us / 1000:.0f}ms")
+    print("\nSelf time by top-level package (* = project):")
+    for package, self_us in sorted(by_package.items(), key=lambda kv: -kv[1])[:args.top]:
+        marker = "*" if package in packages else " "
+        print(f"  {marker} {package:<30} {self_us / 1000:8.1f}ms")
+
+    print("\nSlowest imports (cumulative):")
+    for record in sorted(records, key=lambda r: -r.cumulative_us)[:args.top]:
+        print(f"    {record.module:<45} {record.cumulative_us / 1000:8.1f}ms")
+
+    within = project_us / 1000 <= args.budget_ms
+    print(f"\nProject-attributable import time: {project_us / 1000:.1f}ms "
+          f"(budget {args.budget_ms:.0f}ms) -> {'OK' if within else 'OVER BUDGET'}")
+    return 0 if within else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,446 @@
+"""
+Concurrent ledger consistency verifier for transfer / withdraw / deposit load.
+
+1. Opens a pool of fresh accounts for the default customer and snapshots
+   their balances.
+2. Fires a randomized workload of transfers, withdrawals and deposits across
+   the pool from many threads (one APIClient per thread), recording for each
+   operation when it was sent, when it was acknowledged and the outcome.
+3. Pulls every account's balance and transaction history and checks, with
+   NumPy across all accounts at once:
+     - conservation: the pool's total balance moved only by deposits and
+       withdrawals (transfers net to zero),
+     - per-account balances against the client-side expectation,
+     - the running-balance invariant: opening balance plus the history's
+       entries equals the reported balance,
+     - every acknowledged operation left exactly the expected history
+       entries (lost updates, duplicates, misrouted, torn transfers,
+       phantom entries from rejected operations),
+     - lost updates that leave the history intact: an account whose history
+       adds up to the expected change while its balance does not had an
+       update overwritten (a non-atomic read-modify-write),
+     - real-time ordering: an entry may not be ordered before one whose
+       operation was acknowledged before this one was even sent.
+
+Each operation carries a unique amount (in cents) so that its history
+entries can be traced back to it without relying on descriptions or dates.
+Exits with status 1 when any anomaly is found.
+
+Usage:
+    python -m tools.ledger_verifier --accounts 1000 --operations 20000 --concurrency 32
+    python -m tools.ledger_verifier --stand-in --accounts 200 --operations 5000
+    python -m tools.ledger_verifier --stand-in --unsafe   # non-atomic stand-in; expect anomalies
+"""
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from data.test_data import ACCOUNT_DATA, DEFAULT_CUSTOMER
+from tools.stand_in import spawn as spawn_stand_in
+
+logger = logging.getLogger(__name__)
+
+OP_TRANSFER, OP_WITHDRAW, OP_DEPOSIT = 0, 1, 2
+OP_NAMES = {"transfer": OP_TRANSFER, "withdraw": OP_WITHDRAW, "deposit": OP_DEPOSIT}
+STATUS_PENDING, STATUS_ACKED, STATUS_REJECTED, STATUS_INDETERMINATE = 0, 1, 2, 3
+# $100.01 upwards: above Parabank's $100.00 account-opening deposit, so
+# operation amounts never collide with entries we did not create
+BASE_AMOUNT_CENTS = 10001
+DEFAULT_MIX = "transfer=3,withdraw=1,deposit=1"
+
+
+@dataclass
+class Workload:
+    """Struct-of-arrays description of every operation and its outcome."""
+    kind: np.ndarray          # OP_* per operation
+    account: np.ndarray       # pool index debited (transfer/withdraw) or credited (deposit)
+    counterparty: np.ndarray  # pool index credited by a transfer, -1 otherwise
+    amount_cents: np.ndarray
+    sent_ns: np.ndarray
+    acked_ns: np.ndarray
+    status: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+
+@dataclass
+class LedgerReport:
+    accounts: int
+    operations: int
+    acknowledged: int
+    rejected: int
+    indeterminate: int
+    indeterminate_applied: int
+    throughput_ops_s: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    conserved: bool
+    expected_net_cents: int
+    observed_net_cents: int
+    balance_mismatches: int
+    balance_mismatch_cents: int
+    running_balance_violations: int
+    lost_updates: int
+    duplicate_entries: int
+    misrouted_entries: int
+    torn_transfers: int
+    phantom_entries: int
+    duplicate_transaction_ids: int
+    ordering_anomalies: int
+
+    @property
+    def anomalies(self) -> Dict[str, int]:
+        found = {
+            "conservation": int(not self.conserved),
+            "balance_mismatches": self.balance_mismatches,
+            "running_balance_violations": self.running_balance_violations,
+            "lost_updates": self.lost_updates,
+            "duplicate_entries": self.duplicate_entries,
+            "misrouted_entries": self.misrouted_entries,
+            "torn_transfers": self.torn_transfers,
+            "phantom_entries": self.phantom_entries,
+            "duplicate_transaction_ids": self.duplicate_transaction_ids,
+            "ordering_anomalies": self.ordering_anomalies,
+        }
+        return {name: count for name, count in found.items() if count}
+
+
+def parse_mix(value: str) -> Dict[int, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OP_NAMES:
+            raise argparse.ArgumentTypeError(f"Unknown operation {name!r}; choose from {sorted(OP_NAMES)}")
+        mix[OP_NAMES[name.strip()]] = float(weight or 1)
+    return mix
+
+
+def build_workload(operations: int, accounts: int, mix: Dict[int, float], seed: int) -> Workload:
+    if accounts < 2 and mix.get(OP_TRANSFER):
+        raise ValueError("Transfers need at least two accounts")
+    rng = np.random.default_rng(seed)
+    kinds = np.array(list(mix), dtype=np.int8)
+    weights = np.array([mix[k] for k in kinds], dtype=float)
+    kind = rng.choice(kinds, size=operations, p=weights / weights.sum())
+    account = rng.integers(0, accounts, size=operations, dtype=np.int64)
+    # Any other account in the pool, never the source itself
+    offset = rng.integers(1, max(accounts, 2), size=operations, dtype=np.int64)
+    counterparty = np.where(kind == OP_TRANSFER, (account + offset) % accounts, -1)
+    return Workload(
+        kind=kind,
+        account=account,
+        counterparty=counterparty,
+        amount_cents=BASE_AMOUNT_CENTS + np.arange(operations, dtype=np.int64),
+        sent_ns=np.zeros(operations, dtype=np.int64),
+        acked_ns=np.zeros(operations, dtype=np.int64),
+        status=np.zeros(operations, dtype=np.int8),
+    )
+
+
+class ThreadLocalServices:
+    """One APIClient (and connection pool) per worker thread."""
+
+    def __init__(self, base_url: str, timeout: int):
+        self.base_url = base_url
+        self.timeout = timeout
+        self._local = threading.local()
+        self._clients = []
+        self._lock = threading.Lock()
+
+    def get(self):
+        services = getattr(self._local, "services", None)
+        if services is None:
+            from core.api_client import APIClient
+            from services import AccountsService
+
+            client = APIClient(base_url=self.base_url, timeout=self.timeout)
+            services = self._local.services = AccountsService(client)
+            with self._lock:
+                self._clients.append(client)
+        return services
+
+    def close(self) -> None:
+        for client in self._clients:
+            client.session.close()
+
+
+def open_accounts(pool: ThreadPoolExecutor, services: ThreadLocalServices, count: int) -> List[int]:
+    def create(_: int) -> int:
+        response, account = services.get().create_account(
+            DEFAULT_CUSTOMER.ID, ACCOUNT_DATA.NEW_ACCOUNT_TYPE_CHECKING, ACCOUNT_DATA.DEFAULT_ID)
+        if account is None:
+            raise RuntimeError(f"Could not open an account: HTTP {response.status_code} {response.text[:200]}")
+        return account.id
+
+    return list(pool.map(create, range(count)))
+
+
+def fetch_balances(pool: ThreadPoolExecutor, services: ThreadLocalServices, account_ids: List[int]) -> np.ndarray:
+    def balance(account_id: int) -> int:
+        response, account = services.get().get_account(account_id)
+        if account is None:
+            raise RuntimeError(f"Could not read account {account_id}: HTTP {response.status_code}")
+        return round(account.balance * 100)
+
+    return np.fromiter(pool.map(balance, account_ids), dtype=np.int64, count=len(account_ids))
+
+
+def fetch_histories(pool: ThreadPoolExecutor, services: ThreadLocalServices,
+                    account_ids: List[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Flatten all histories into (pool index, transaction id, signed cents) arrays."""
+    def history(index_and_id: Tuple[int, int]) -> List[Tuple[int, int, int]]:
+        index, account_id = index_and_id
+        response, transactions = services.get().get_transactions(account_id)
+        if transactions is None:
+            raise RuntimeError(f"Could not read history of {account_id}: HTTP {response.status_code}")
+        return [(index, tx.id, round(tx.amount * 100) * (1 if tx.type == "Credit" else -1))
+                for tx in transactions]
+
+    rows = [row for rows in pool.map(history, enumerate(account_ids)) for row in rows]
+    data = np.array(rows, dtype=np.int64).reshape(-1, 3)
+    return data[:, 0], data[:, 1], data[:, 2]
+
+
+def execute(pool: ThreadPoolExecutor, services: ThreadLocalServices, workload: Workload,
+            account_ids: List[int], batch_size: int) -> float:
+    """Run the workload in concurrent batches; returns the load-phase wall time."""
+    from core.exceptions import APIError
+
+    def run(op: int) -> None:
+        accounts = services.get()
+        amount = int(workload.amount_cents[op]) / 100
+        source = account_ids[workload.account[op]]
+        kind = workload.kind[op]
+        workload.sent_ns[op] = time.monotonic_ns()
+        try:
+            if kind == OP_TRANSFER:
+                response = accounts.transfer(source, account_ids[workload.counterparty[op]], amount)
+            elif kind == OP_WITHDRAW:
+                response = accounts.withdraw(source, amount)
+            else:
+                response = accounts.deposit(source, amount)
+            status = STATUS_ACKED if response.status_code == 200 else (
+                STATUS_INDETERMINATE if response.status_code >= 500 else STATUS_REJECTED)
+        except APIError:
+            # Timed out or dropped: the server may or may not have applied it
+            status = STATUS_INDETERMINATE
+        workload.acked_ns[op] = time.monotonic_ns()
+        workload.status[op] = status
+
+    start = time.perf_counter()
+    for first in range(0, len(workload), batch_size):
+        batch_start = time.perf_counter()
+        ops = range(first, min(len(workload), first + batch_size))
+        list(pool.map(run, ops))
+        logger.info(f"Batch {first // batch_size + 1}: {len(ops)} ops at "
+                    f"{len(ops) / (time.perf_counter() - batch_start):.0f} ops/s")
+    return time.perf_counter() - start
+
+
+def expected_entries(workload: Workload) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """History entries each operation should produce: (operation, pool index, sign)."""
+    ops = np.arange(len(workload))
+    transfers = workload.kind == OP_TRANSFER
+    debits = workload.kind != OP_DEPOSIT
+    op = np.concatenate([ops, ops[transfers]])
+    account = np.concatenate([workload.account, workload.counterparty[transfers]])
+    sign = np.concatenate([np.where(debits, -1, 1), np.ones(transfers.sum(), dtype=np.int64)])
+    return op, account, sign
+
+
+def next_in_group_min(group: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    For arrays sorted by group, the minimum of values strictly after each
+    position within the same group (int64 max where there is none).
+    Vectorized as one reversed running minimum, with each group offset far
+    enough below the previous one that minima never leak across groups.
+    """
+    if len(values) == 0:
+        return values.copy()
+    rev_group, rev_values = group[::-1], values[::-1]
+    ordinal = np.concatenate([[0], np.cumsum(rev_group[1:] != rev_group[:-1])])
+    span = int(values.max() - values.min()) + 1
+    inclusive = (np.minimum.accumulate(rev_values - ordinal * span) + ordinal * span)[::-1]
+    after = np.full_like(values, np.iinfo(np.int64).max)
+    same_group = group[1:] == group[:-1]
+    after[:-1][same_group] = inclusive[1:][same_group]
+    return after
+
+
+def analyze(workload: Workload, opening: np.ndarray, closing: np.ndarray, hist_account: np.ndarray,
+            hist_id: np.ndarray, hist_cents: np.ndarray, load_seconds: float) -> LedgerReport:
+    n_ops, n_accounts = len(workload), len(opening)
+    status = workload.status
+    acked = status == STATUS_ACKED
+
+    # Keep only history entries whose amount identifies one of our operations
+    hist_op = np.abs(hist_cents) - BASE_AMOUNT_CENTS
+    ours = (hist_op >= 0) & (hist_op < n_ops)
+    h_op, h_acc, h_id, h_cents = hist_op[ours], hist_account[ours], hist_id[ours], hist_cents[ours]
+    h_sign = np.sign(h_cents)
+
+    def entry_key(op, account, sign):
+        return (op * n_accounts + account) * 2 + (sign > 0)
+
+    e_op, e_acc, e_sign = expected_entries(workload)
+    e_key = entry_key(e_op, e_acc, e_sign)
+    h_key = entry_key(h_op, h_acc, h_sign)
+    obs_keys, obs_counts = np.unique(h_key, return_counts=True)
+
+    # How often each expected entry appears in the history
+    e_count = np.zeros(len(e_key), dtype=np.int64)
+    if len(obs_keys):
+        pos = np.minimum(np.searchsorted(obs_keys, e_key), len(obs_keys) - 1)
+        e_count = np.where(obs_keys[pos] == e_key, obs_counts[pos], 0)
+    # Acknowledged entries missing from the history; overwritten balances are added below
+    lost = int(np.sum(acked[e_op] & (e_count == 0)))
+    duplicates = int(np.sum(np.maximum(obs_counts - 1, 0)))
+    misrouted = int(np.sum(~np.isin(h_key, e_key)))
+    phantom = int(np.sum((status[h_op] == STATUS_REJECTED) & np.isin(h_key, e_key)))
+
+    # A transfer is torn when exactly one of its two legs was recorded
+    legs_seen = np.bincount(e_op, weights=(e_count > 0), minlength=n_ops)
+    torn = int(np.sum((workload.kind == OP_TRANSFER) & (legs_seen == 1)))
+
+    # Indeterminate operations count as applied if their entries made it into the history
+    applied_op = acked.copy()
+    indeterminate = status == STATUS_INDETERMINATE
+    seen_op = legs_seen > 0
+    applied_op |= indeterminate & seen_op
+    applied_entries = applied_op[e_op]
+    amounts = workload.amount_cents[e_op] * e_sign
+    expected_delta = np.bincount(e_acc[applied_entries], weights=amounts[applied_entries],
+                                 minlength=n_accounts).astype(np.int64)
+    history_delta = np.bincount(h_acc, weights=h_cents, minlength=n_accounts).astype(np.int64)
+    observed_delta = closing - opening
+
+    mismatch = observed_delta != expected_delta
+    # Every entry is there but the balance missed some of them: an overwritten update
+    overwritten = (history_delta == expected_delta) & mismatch
+    lost += int(overwritten.sum())
+    external = np.where(workload.kind == OP_DEPOSIT, 1, np.where(workload.kind == OP_WITHDRAW, -1, 0))
+    expected_net = int(np.sum(external * workload.amount_cents * applied_op))
+    observed_net = int(observed_delta.sum())
+
+    # Ordering: server order (transaction id) within each account vs client real time
+    order = np.lexsort((h_id, h_acc))
+    s_acc, s_id, s_op = h_acc[order], h_id[order], h_op[order]
+    sent = workload.sent_ns[s_op]
+    acked_at = np.where(acked[s_op], workload.acked_ns[s_op], np.iinfo(np.int64).max // 2)
+    ordering = int(np.sum(next_in_group_min(s_acc, acked_at) < sent))
+    # A transfer's two legs may legitimately share one id on some backends; only count
+    # ids reused across different operations
+    id_op_pairs = np.unique(np.stack([h_id, h_op], axis=1), axis=0) if len(h_id) else np.empty((0, 2))
+    _, ids_per_op = np.unique(id_op_pairs[:, 0], return_counts=True)
+    duplicate_ids = int(np.sum(ids_per_op > 1))
+
+    latency_ms = (workload.acked_ns - workload.sent_ns)[status != STATUS_PENDING] / 1e6
+    return LedgerReport(
+        accounts=n_accounts,
+        operations=n_ops,
+        acknowledged=int(acked.sum()),
+        rejected=int(np.sum(status == STATUS_REJECTED)),
+        indeterminate=int(indeterminate.sum()),
+        indeterminate_applied=int(np.sum(indeterminate & seen_op)),
+        throughput_ops_s=n_ops / load_seconds if load_seconds else 0.0,
+        latency_p50_ms=float(np.percentile(latency_ms, 50)) if len(latency_ms) else 0.0,
+        latency_p95_ms=float(np.percentile(latency_ms, 95)) if len(latency_ms) else 0.0,
+        conserved=expected_net == observed_net,
+        expected_net_cents=expected_net,
+        observed_net_cents=observed_net,
+        balance_mismatches=int(mismatch.sum()),
+        balance_mismatch_cents=int(np.abs(observed_delta - expected_delta).sum()),
+        running_balance_violations=int(np.sum(history_delta != observed_delta)),
+        lost_updates=lost,
+        duplicate_entries=duplicates,
+        misrouted_entries=misrouted,
+        torn_transfers=torn,
+        phantom_entries=phantom,
+        duplicate_transaction_ids=duplicate_ids,
+        ordering_anomalies=ordering,
+    )
+
+
+def print_report(report: LedgerReport) -> None:
+    print(f"\nLedger verification: {report.operations} operations across {report.accounts} accounts")
+    print(f"  acknowledged {report.acknowledged}, rejected {report.rejected}, "
+          f"indeterminate {report.indeterminate} ({report.indeterminate_applied} found applied)")
+    print(f"  throughput {report.throughput_ops_s:.0f} ops/s, "
+          f"latency p50 {report.latency_p50_ms:.1f}ms / p95 {report.latency_p95_ms:.1f}ms")
+    print(f"  conservation: expected net {report.expected_net_cents / 100:+.2f}, "
+          f"observed {report.observed_net_cents / 100:+.2f} -> {'OK' if report.conserved else 'VIOLATED'}")
+    print(f"  balance mismatches {report.balance_mismatches} accounts "
+          f"({report.balance_mismatch_cents / 100:.2f} total), "
+          f"running-balance violations {report.running_balance_violations}")
+    print(f"  lost updates {report.lost_updates}, duplicate entries {report.duplicate_entries}, "
+          f"misrouted {report.misrouted_entries}, torn transfers {report.torn_transfers}, "
+          f"phantom {report.phantom_entries}")
+    print(f"  duplicate transaction ids {report.duplicate_transaction_ids}, "
+          f"ordering anomalies {report.ordering_anomalies}")
+    anomalies = report.anomalies
+    print(f"\n{'ANOMALIES: ' + ', '.join(f'{k}={v}' for k, v in anomalies.items()) if anomalies else 'Ledger consistent.'}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=100, help="Fresh accounts to open (default: 100)")
+    parser.add_argument("--operations", type=int, default=2000, help="Operations to run (default: 2000)")
+    parser.add_argument("--concurrency", type=int, default=32, help="Worker threads (default: 32)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Operations per concurrent batch")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Weighted operation mix (default: {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base-url", default=None, help="Target API (default: BASE_URL from settings)")
+    parser.add_argument("--stand-in", action="store_true", help="Verify a local stand-in instead of BASE_URL")
+    parser.add_argument("--unsafe", action="store_true", help="Use a non-atomic stand-in (implies --stand-in)")
+    parser.add_argument("--report", default=None, help="Write the report to this JSON file")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    logging.getLogger("core.api_client").setLevel(logging.WARNING)
+
+    from config.settings import settings
+    stand_in = None
+    base_url = args.base_url
+    if args.stand_in or args.unsafe:
+        stand_in, base_url = spawn_stand_in(*(["--unsafe"] if args.unsafe else []))
+    base_url = base_url or settings.BASE_URL
+
+    services = ThreadLocalServices(base_url, settings.TIMEOUT)
+    workload = build_workload(args.operations, args.accounts, args.mix, args.seed)
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            logger.info(f"Opening {args.accounts} accounts on {base_url}")
+            account_ids = open_accounts(pool, services, args.accounts)
+            opening = fetch_balances(pool, services, account_ids)
+            logger.info(f"Running {args.operations} operations with {args.concurrency} threads")
+            load_seconds = execute(pool, services, workload, account_ids, args.batch_size)
+            logger.info("Fetching balances and transaction histories")
+            closing = fetch_balances(pool, services, account_ids)
+            hist_account, hist_id, hist_cents = fetch_histories(pool, services, account_ids)
+    finally:
+        services.close()
+        if stand_in is not None:
+            stand_in.terminate()
+            stand_in.wait()
+
+    analysis_start = time.perf_counter()
+    report = analyze(workload, opening, closing, hist_account, hist_id, hist_cents, load_seconds)
+    logger.info(f"Analyzed {len(hist_id)} history entries in {(time.perf_counter() - analysis_start) * 1000:.1f}ms")
+    print_report(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as handle:
+            json.dump({**asdict(report), "anomalies": report.anomalies}, handle, indent=2)
+    return 1 if report.anomalies else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
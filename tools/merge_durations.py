@@ -0,0 +1,48 @@
+"""
+Fold the durations observed by sharded CI runs back into the durations file.
+
+Shard runs (``--shard K/N``) plan from the durations file but never write to
+it, so that all shards of one CI run see the same estimates. Give each shard
+``--scheduler-output shard-K.json`` and, once every shard has finished, merge
+the outputs so the next run plans from them.
+
+Usage:
+    python -m tools.merge_durations shard-*.json
+    python -m tools.merge_durations --durations-path ci/.test_durations.json shard-1.json shard-2.json
+"""
+import argparse
+import logging
+import sys
+from typing import List
+
+from plugins.scheduler import DEFAULT_DURATIONS_PATH, DurationStore
+
+logger = logging.getLogger(__name__)
+
+
+def merge_durations(durations_path: str, output_paths: List[str]) -> DurationStore:
+    """Apply each shard output to the store at durations_path and save it."""
+    store = DurationStore(durations_path)
+    for path in output_paths:
+        observed = DurationStore(path)
+        store.update(observed.tests, observed.fixtures)
+        logger.info(f"Merged {len(observed.tests)} test durations from {path}")
+    store.save()
+    return store
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("outputs", nargs="+", help="--scheduler-output files written by shard runs")
+    parser.add_argument("--durations-path", default=DEFAULT_DURATIONS_PATH,
+                        help=f"Durations file to update (default: {DEFAULT_DURATIONS_PATH})")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    store = merge_durations(args.durations_path, args.outputs)
+    logger.info(f"{args.durations_path}: {len(store.tests)} tests, {len(store.fixtures)} session fixtures")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
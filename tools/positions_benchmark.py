@@ -0,0 +1,181 @@
+"""
+Benchmark for position history fetching, the history window cache and the
+NumPy portfolio analytics, against a local stand-in with synthetic prices.
+
+1. Starts the stand-in (optionally with per-response latency), funds the
+   default account and buys --positions positions in synthetic symbols.
+2. Fetches one --days history window for every position sequentially and
+   concurrently (PositionsService.get_position_histories).
+3. Runs the same window through PriceHistoryCache cold, warm, and extended
+   by --extend-days, counting requests and points transferred against a
+   naive full re-fetch.
+4. Builds the (days x positions) price matrix and computes valuation,
+   returns and drawdowns with core.portfolio, cross-checking the valuation
+   against a pure-Python loop.
+
+Usage:
+    python -m tools.positions_benchmark --positions 1000 --days 365 --latency-ms 2
+    python -m tools.positions_benchmark --base-url http://localhost:8080/parabank/services/bank
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+import numpy as np
+
+from data.test_data import ACCOUNT_DATA, DEFAULT_CUSTOMER
+from tools.stand_in import spawn as spawn_stand_in
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_END_DATE = "12-31-2024"
+
+
+def parse_date(value: str) -> date:
+    from core.history_cache import HISTORY_DATE_FORMAT
+
+    try:
+        return datetime.strptime(value, HISTORY_DATE_FORMAT).date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected a MM-DD-YYYY date, got {value!r}")
+
+
+def timed(label: str, results: Dict[str, float], func, *args, **kwargs):
+    start = time.perf_counter()
+    value = func(*args, **kwargs)
+    results[label] = (time.perf_counter() - start) * 1000
+    logger.info(f"{label}: {results[label]:.1f}ms")
+    return value
+
+
+def python_valuation(prices: List[List[float]], shares: List[float], purchase_prices: List[float]) -> List[float]:
+    """Reference valuation loop, for correctness and as the speed baseline."""
+    values = []
+    for row in prices:
+        total = 0.0
+        for price, held, cost in zip(row, shares, purchase_prices):
+            total += (cost if price != price else price) * held  # NaN != NaN
+        values.append(total)
+    return values
+
+
+def buy_positions(positions_service, count: int, workers: int) -> None:
+    def buy(index: int) -> None:
+        response, _ = positions_service.buy_position(
+            customer_id=DEFAULT_CUSTOMER.ID,
+            account_id=ACCOUNT_DATA.DEFAULT_ID,
+            name=f"Synthetic Instrument {index}",
+            symbol=f"SYN{index:05d}",
+            shares=1 + index % 50,
+            price_per_share=round(10 + index % 90 + 0.25, 2),
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"buyPosition failed: HTTP {response.status_code} {response.text[:200]}")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(buy, range(count)))
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--positions", type=int, default=500, help="Positions to buy (default: 500)")
+    parser.add_argument("--days", type=int, default=365, help="Calendar days in the history window (default: 365)")
+    parser.add_argument("--extend-days", type=int, default=30, help="Days the window is extended by (default: 30)")
+    parser.add_argument("--end", type=parse_date, default=DEFAULT_END_DATE,
+                        help=f"Window end date, MM-DD-YYYY (default: {DEFAULT_END_DATE})")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent history requests (default: 8)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Stand-in latency per response")
+    parser.add_argument("--base-url", default=None, help="Benchmark this API instead of a local stand-in")
+    parser.add_argument("--report", default=None, help="Write timings and counters to this JSON file")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    logging.getLogger("core.api_client").setLevel(logging.WARNING)
+
+    from config.settings import settings
+    from core.api_client import APIClient
+    from core.history_cache import HISTORY_DATE_FORMAT, PriceHistoryCache
+    from core.portfolio import analyze_portfolio, build_price_matrix
+    from services import AccountsService, AdminService, PositionsService
+
+    stand_in, base_url = (None, args.base_url) if args.base_url else spawn_stand_in(
+        "--latency-ms", str(args.latency_ms))
+    client = APIClient(base_url=base_url, timeout=settings.TIMEOUT)
+    positions_service = PositionsService(client)
+    timings: Dict[str, float] = {}
+    counters: Dict[str, int] = {}
+    start = args.end - timedelta(days=args.days - 1)
+    extended_end = args.end + timedelta(days=args.extend_days)
+    start_text, end_text = start.strftime(HISTORY_DATE_FORMAT), args.end.strftime(HISTORY_DATE_FORMAT)
+    try:
+        AdminService(client).initialize_db()
+        AccountsService(client).deposit(ACCOUNT_DATA.DEFAULT_ID, 1_000_000)
+        logger.info(f"Buying {args.positions} positions on {base_url}")
+        timed("buy positions", timings, buy_positions, positions_service, args.positions, args.workers)
+        _, positions = positions_service.get_positions(DEFAULT_CUSTOMER.ID)
+        position_ids = [p.positionId for p in positions]
+        # Warm the server's per-symbol series so both fetch strategies see the same server cost
+        positions_service.get_position_histories(position_ids, end_text, end_text, max_workers=args.workers)
+
+        sequential = timed("fetch sequential", timings, lambda: [
+            positions_service.get_position_history(pid, start_text, end_text) for pid in position_ids])
+        concurrent = timed("fetch concurrent", timings, positions_service.get_position_histories,
+                           position_ids, start_text, end_text, max_workers=args.workers)
+        window_points = sum(len(history) for _, history in concurrent.values())
+        assert window_points == sum(len(history) for _, history in sequential)
+
+        cache = PriceHistoryCache(positions_service, max_workers=args.workers)
+        timed("cache cold window", timings, cache.windows, position_ids, start, args.end)
+        counters["cold requests"], counters["cold points"] = cache.stats.requests, cache.stats.points_fetched
+        timed("cache warm window", timings, cache.windows, position_ids, start, args.end)
+        counters["warm requests"] = cache.stats.requests - counters["cold requests"]
+        windows = timed("cache extended window", timings, cache.windows, position_ids, start, extended_end)
+        counters["extended requests"] = cache.stats.requests - counters["cold requests"] - counters["warm requests"]
+        counters["extended points"] = cache.stats.points_fetched - counters["cold points"]
+        counters["naive extended points"] = sum(len(days) for days, _ in windows.values())
+    finally:
+        client.session.close()
+        if stand_in is not None:
+            stand_in.terminate()
+            stand_in.wait()
+
+    by_id = {p.positionId: p for p in positions}
+    matrix = timed("build price matrix", timings, build_price_matrix, windows)
+    shares = np.array([by_id[pid].shares for pid in matrix.position_ids], dtype=float)
+    purchase_prices = np.array([by_id[pid].purchasePrice for pid in matrix.position_ids])
+    analytics = timed("numpy analytics", timings, analyze_portfolio, matrix, shares, purchase_prices)
+    reference = timed("python valuation", timings, python_valuation,
+                      matrix.prices.tolist(), shares.tolist(), purchase_prices.tolist())
+    if not np.allclose(analytics.values, reference):
+        logger.error("NumPy valuation disagrees with the pure-Python reference")
+        return 1
+
+    print(f"\nPositions benchmark: {len(position_ids)} positions, {start}..{args.end} "
+          f"(+{args.extend_days} days), {args.workers} workers")
+    for label, elapsed in timings.items():
+        print(f"  {label:<24}{elapsed:>10.1f} ms")
+    print(f"  {'concurrent speedup':<24}{timings['fetch sequential'] / timings['fetch concurrent']:>10.1f} x")
+    print(f"  {'analytics speedup':<24}{timings['python valuation'] / timings['numpy analytics']:>10.1f} x "
+          f"(NumPy valuation + returns + drawdowns vs Python valuation only)")
+    print(f"\n  cache: cold {counters['cold requests']} requests / {counters['cold points']} points, "
+          f"warm {counters['warm requests']} requests, extended {counters['extended requests']} requests / "
+          f"{counters['extended points']} points (naive re-fetch: {counters['naive extended points']} points)")
+    print(f"\n  matrix {matrix.prices.shape[0]} days x {matrix.prices.shape[1]} positions; "
+          f"value {analytics.values[0]:,.2f} -> {analytics.values[-1]:,.2f}, "
+          f"return {analytics.cumulative_returns[-1]:+.2%}, max drawdown {analytics.max_drawdown:.2%}, "
+          f"unrealized P&L {analytics.unrealized_pnl:+,.2f}")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as handle:
+            json.dump({"positions": len(position_ids), "days": int(matrix.prices.shape[0]),
+                       "timings_ms": timings, "cache": counters,
+                       "max_drawdown": analytics.max_drawdown,
+                       "cumulative_return": float(analytics.cumulative_returns[-1])}, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""
+Soak runner: loops API scenarios for a long period and detects resource leaks.
+
+A weighted mix of scenarios runs through the regular APIClient and service
+objects. Every interval a sample records tracemalloc traced memory, open file
+descriptors, open sockets and the requests connection-pool state. After the
+warm-up, a least-squares trend is fitted to each series; the run fails (exit
+status 1) when projected growth over the run exceeds the thresholds, printing
+the call sites that allocated the most since the warm-up snapshot.
+
+Usage:
+    python -m tools.soak --duration 4h --interval 5m
+    python -m tools.soak --stand-in --duration 60s --interval 5s
+    python -m tools.soak --mix get_account=5,transfer=2,login=1
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import random
+import re
+import sys
+import sysconfig
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from data.test_data import ACCOUNT_DATA, DEFAULT_CREDENTIALS, DEFAULT_CUSTOMER, LOAN_DATA, TRANSACTION_DATES
+from tools.stand_in import spawn as spawn_stand_in
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIX = "login=2,get_customer=2,get_account=4,transactions=2,transfer=2,withdraw=1,create_account=1,request_loan=1"
+FD_DIR = "/proc/self/fd"
+
+
+class Services:
+    """One APIClient and the service objects built on it, as the fixtures do."""
+
+    def __init__(self, base_url: str, timeout: int):
+        from core.api_client import APIClient
+        from services import AccountsService, AuthService, CustomersService, LoansService
+
+        self.client = APIClient(base_url=base_url, timeout=timeout)
+        self.auth = AuthService(self.client)
+        self.customers = CustomersService(self.client)
+        self.accounts = AccountsService(self.client)
+        self.loans = LoansService(self.client)
+
+    def close(self) -> None:
+        self.client.session.close()
+
+
+SCENARIOS: Dict[str, Callable[[Services], object]] = {
+    "login": lambda s: s.auth.login(DEFAULT_CREDENTIALS.USERNAME, DEFAULT_CREDENTIALS.PASSWORD),
+    "get_customer": lambda s: s.customers.get_customer(DEFAULT_CUSTOMER.ID),
+    "get_account": lambda s: s.accounts.get_account(ACCOUNT_DATA.DEFAULT_ID),
+    "transactions": lambda s: s.accounts.get_transactions_by_date(
+        ACCOUNT_DATA.DEFAULT_ID, TRANSACTION_DATES.FROM_DATE, TRANSACTION_DATES.TO_DATE),
+    "transfer": lambda s: s.accounts.transfer(
+        ACCOUNT_DATA.DEFAULT_ID, ACCOUNT_DATA.SECONDARY_ID, ACCOUNT_DATA.TRANSFER_AMOUNT),
+    "withdraw": lambda s: s.accounts.withdraw(ACCOUNT_DATA.DEFAULT_ID, ACCOUNT_DATA.TRANSFER_AMOUNT),
+    "create_account": lambda s: s.accounts.create_account(
+        DEFAULT_CUSTOMER.ID, ACCOUNT_DATA.NEW_ACCOUNT_TYPE_CHECKING, ACCOUNT_DATA.DEFAULT_ID),
+    "request_loan": lambda s: s.loans.request_loan(
+        DEFAULT_CUSTOMER.ID, LOAN_DATA.AMOUNT, LOAN_DATA.DOWN_PAYMENT, LOAN_DATA.FROM_ACCOUNT_ID),
+}
+
+
+@dataclass
+class Sample:
+    elapsed_s: float
+    iterations: int
+    errors: int
+    traced_bytes: int
+    open_fds: Optional[int]
+    open_sockets: Optional[int]
+    pools: int
+    opened_connections: int
+
+
+def parse_duration(value: str) -> float:
+    """Parse '90', '45s', '30m' or '4h' into seconds."""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smh]?)", value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid duration: {value!r}")
+    number, unit = match.groups()
+    return float(number) * {"": 1, "s": 1, "m": 60, "h": 3600}[unit]
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Unknown scenario {name!r}; choose from {sorted(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def fd_counts() -> Tuple[Optional[int], Optional[int]]:
+    """Open file descriptors and how many are sockets (Linux /proc only)."""
+    if not os.path.isdir(FD_DIR):
+        return None, None
+    fds = sockets = 0
+    for fd in os.listdir(FD_DIR):
+        try:
+            target = os.readlink(os.path.join(FD_DIR, fd))
+        except OSError:
+            continue  # closed between listdir and readlink (e.g. listdir's own fd)
+        fds += 1
+        sockets += target.startswith("socket:")
+    return fds, sockets
+
+
+def pool_state(services: Services) -> Tuple[int, int]:
+    """Number of urllib3 host pools and connections they have opened so far."""
+    pools = connections = 0
+    # APIClient mounts one adapter for both http:// and https://; count each once
+    adapters = {id(adapter): adapter for adapter in services.client.session.adapters.values()}
+    for adapter in adapters.values():
+        manager = getattr(adapter, "poolmanager", None)
+        if manager is None:
+            continue
+        for key in list(manager.pools.keys()):
+            pool = manager.pools.get(key)
+            if pool is None:
+                continue
+            pools += 1
+            # Stays flat while keep-alive reuses connections; climbs if they are dropped
+            connections += pool.num_connections
+    return pools, connections
+
+
+def slope(points: List[Tuple[float, float]]) -> float:
+    """Least-squares slope of value over time."""
+    n = len(points)
+    if n < 2:
+        return 0.0
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    var_t = sum((t - mean_t) ** 2 for t, _ in points)
+    if var_t == 0:
+        return 0.0
+    return sum((t - mean_t) * (v - mean_v) for t, v in points) / var_t
+
+
+class SoakRunner:
+    def __init__(self, services: Services, mix: Dict[str, float], duration_s: float, interval_s: float,
+                 warmup_s: float, seed: int = 0, frames: int = 10):
+        self.services = services
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.duration_s = duration_s
+        self.interval_s = interval_s
+        self.warmup_s = warmup_s
+        self.rng = random.Random(seed)
+        self.frames = frames
+        self.samples: List[Sample] = []
+        self.counts: Dict[str, int] = {name: 0 for name in self.names}
+        self.iterations = 0
+        self.errors = 0
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+        self.final: Optional[tracemalloc.Snapshot] = None
+
+    def _sample(self, elapsed_s: float) -> Sample:
+        gc.collect()
+        traced, _ = tracemalloc.get_traced_memory()
+        fds, sockets = fd_counts()
+        pools, connections = pool_state(self.services)
+        sample = Sample(round(elapsed_s, 2), self.iterations, self.errors, traced, fds, sockets, pools, connections)
+        self.samples.append(sample)
+        logger.info(
+            f"[soak {elapsed_s:8.0f}s] iterations={self.iterations} errors={self.errors} "
+            f"traced={traced / 1024:.0f}KiB fds={fds} sockets={sockets} pools={pools} opened={connections}"
+        )
+        return sample
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        gc.collect()
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+
+    def run(self) -> None:
+        tracemalloc.start(self.frames)
+        start = time.monotonic()
+        next_sample = start
+        warmed_up = False
+        try:
+            while True:
+                now = time.monotonic()
+                elapsed = now - start
+                if now >= next_sample:
+                    if not warmed_up and elapsed >= self.warmup_s:
+                        # Baseline after warm-up so import caches, pools and
+                        # pydantic schemas built on first use are not counted
+                        self.baseline = self._snapshot()
+                        warmed_up = True
+                    self._sample(elapsed)
+                    next_sample += self.interval_s
+                if elapsed >= self.duration_s:
+                    break
+                name = self.rng.choices(self.names, self.weights)[0]
+                try:
+                    SCENARIOS[name](self.services)
+                except Exception as exc:  # keep soaking through transient API failures
+                    self.errors += 1
+                    logger.debug(f"Scenario {name} failed: {exc}")
+                self.counts[name] += 1
+                self.iterations += 1
+            self.final = self._snapshot()
+            if self.baseline is None:
+                self.baseline = self.final
+        finally:
+            tracemalloc.stop()
+
+    def trend(self, field: str) -> Optional[float]:
+        """Projected growth of a sample field across the post-warm-up window."""
+        points = [(s.elapsed_s, getattr(s, field)) for s in self.samples
+                  if s.elapsed_s >= self.warmup_s and getattr(s, field) is not None]
+        if len(points) < 3:
+            return None
+        return slope(points) * (points[-1][0] - points[0][0])
+
+    def top_allocations(self, limit: int) -> List[str]:
+        """Largest allocation growth since warm-up, with the nearest non-library caller."""
+        library_paths = tuple({sysconfig.get_paths()[key] for key in ("stdlib", "purelib", "platlib")})
+        lines = []
+        for stat in self.final.compare_to(self.baseline, "traceback")[:limit]:
+            if stat.size_diff <= 0:
+                break
+            frames = list(stat.traceback)  # oldest first
+            callers = [f for f in frames if not f.filename.startswith(library_paths)]
+            lines.append(f"{stat.size_diff / 1024:+.1f} KiB in {stat.count_diff:+d} blocks")
+            lines.append(f"    allocated at {frames[-1].filename}:{frames[-1].lineno}")
+            if callers and callers[-1] is not frames[-1]:
+                lines.append(f"    called from  {callers[-1].filename}:{callers[-1].lineno}")
+        return lines
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=parse_duration, default=parse_duration("1h"),
+                        help="Total run time, e.g. 90s, 30m, 4h (default: 1h)")
+    parser.add_argument("--interval", type=parse_duration, default=None,
+                        help="Sampling interval (default: duration / 60)")
+    parser.add_argument("--warmup", type=parse_duration, default=None,
+                        help="Time excluded from the trend (default: 10%% of duration)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Weighted scenario mix (default: {DEFAULT_MIX})")
+    parser.add_argument("--base-url", default=None, help="Target API (default: BASE_URL from settings)")
+    parser.add_argument("--stand-in", action="store_true", help="Soak a local stand-in instead of BASE_URL")
+    parser.add_argument("--max-memory-growth-kb", type=float, default=1024.0,
+                        help="Fail when traced memory is projected to grow more than this (default: 1024)")
+    parser.add_argument("--max-fd-growth", type=float, default=5.0,
+                        help="Fail when open fds or sockets are projected to grow more than this (default: 5)")
+    parser.add_argument("--top", type=int, default=10, help="Allocation sites to print on failure")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", default=None, help="Write samples and verdict to this JSON file")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    # Per-request logging would dominate both the output and the traced memory
+    logging.getLogger("core.api_client").setLevel(logging.WARNING)
+
+    interval = args.interval or max(1.0, args.duration / 60)
+    warmup = args.warmup if args.warmup is not None else args.duration * 0.1
+
+    from config.settings import settings
+    stand_in = None
+    base_url = args.base_url
+    if args.stand_in:
+        stand_in, base_url = spawn_stand_in()
+    base_url = base_url or settings.BASE_URL
+
+    services = Services(base_url, settings.TIMEOUT)
+    runner = SoakRunner(services, args.mix, args.duration, interval, warmup, args.seed)
+    try:
+        logger.info(f"Soaking {base_url} for {args.duration:.0f}s (sample every {interval:.0f}s, warm-up {warmup:.0f}s)")
+        runner.run()
+    finally:
+        services.close()
+        if stand_in is not None:
+            stand_in.terminate()
+            stand_in.wait()
+
+    growth = {
+        "traced_bytes": runner.trend("traced_bytes"),
+        "open_fds": runner.trend("open_fds"),
+        "open_sockets": runner.trend("open_sockets"),
+        "opened_connections": runner.trend("opened_connections"),
+    }
+    limits = {
+        "traced_bytes": args.max_memory_growth_kb * 1024,
+        "open_fds": args.max_fd_growth,
+        "open_sockets": args.max_fd_growth,
+        "opened_connections": args.max_fd_growth,
+    }
+    exceeded = [name for name, value in growth.items() if value is not None and value > limits[name]]
+
+    print(f"\nSoak summary: {runner.iterations} iterations, {runner.errors} errors, {len(runner.samples)} samples")
+    print("Scenario counts: " + ", ".join(f"{name}={count}" for name, count in runner.counts.items()))
+    for name, value in growth.items():
+        shown = "n/a (too few samples)" if value is None else f"{value:+.1f} (limit {limits[name]:.0f})"
+        print(f"  projected growth {name:<20} {shown}")
+    if exceeded:
+        print(f"\nLEAK SUSPECTED: {', '.join(exceeded)} grew beyond threshold. Top allocation sites since warm-up:")
+        for line in runner.top_allocations(args.top):
+            print(f"  {line}")
+    else:
+        print("\nNo resource growth beyond thresholds.")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as handle:
+            json.dump({"samples": [asdict(s) for s in runner.samples], "growth": growth,
+                       "exceeded": exceeded, "counts": runner.counts}, handle, indent=2)
+    return 1 if exceeded else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
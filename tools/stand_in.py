@@ -0,0 +1,462 @@
+"""
+In-memory local stand-in for the Parabank REST API.
+
+Implements the subset of endpoints the services use (login, customers,
+accounts, transfer/withdraw/deposit, transactions, loans, positions, admin)
+with JSON responses shaped like the real backend, seeded from data.test_data.
+Position price history is a synthetic, deterministic random walk per symbol.
+Used to exercise tools and the suite without the public demo server.
+
+Usage:
+    python -m tools.stand_in [--port 8080] [--latency-ms 0] [--unsafe]
+
+--unsafe drops the bank lock and widens the read-modify-write window on
+balances, reproducing lost updates so consistency checks can be exercised.
+
+or in-process:
+    with StandInServer() as server:
+        client = APIClient(server.base_url)
+"""
+import argparse
+import contextlib
+import functools
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from data.test_data import ACCOUNT_DATA, DEFAULT_CREDENTIALS, DEFAULT_CUSTOMER
+
+# Balances the seed accounts start with after /initializeDB
+SEED_BALANCE = 1000.00
+# Parabank funds every new account with this amount from the source account
+NEW_ACCOUNT_DEPOSIT = 100.00
+ACCOUNT_TYPES = {0: "CHECKING", 1: "SAVINGS", 2: "LOAN"}
+DATE_FORMAT = "%m-%d-%Y"
+# Span of the synthetic price series (business days only)
+PRICE_SERIES_START = date(2015, 1, 1)
+PRICE_SERIES_END = date(2030, 12, 31)
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@functools.lru_cache(maxsize=None)
+def price_series(symbol: str):
+    """
+    Deterministic geometric random walk of closing prices for a symbol:
+    (business-day ordinals, prices) as NumPy arrays. Same symbol, same series.
+    """
+    import numpy as np
+
+    days = np.arange(PRICE_SERIES_START.toordinal(), PRICE_SERIES_END.toordinal() + 1)
+    # date.toordinal() 1 is a Monday, so ordinal % 7 in 1..5 are weekdays
+    days = days[(days % 7 >= 1) & (days % 7 <= 5)]
+    rng = np.random.default_rng(zlib.crc32(symbol.encode("utf-8")))
+    start_price = rng.uniform(20, 500)
+    log_returns = rng.normal(0.0002, 0.02, size=len(days))
+    return days, np.round(start_price * np.exp(np.cumsum(log_returns)), 2)
+
+
+class Bank:
+    """In-memory bank state; thread-safe unless atomic is False."""
+
+    def __init__(self, atomic: bool = True):
+        self.atomic = atomic
+        self.lock = threading.Lock() if atomic else contextlib.nullcontext()
+        self.initialize()
+
+    def initialize(self) -> None:
+        with self.lock:
+            self.customers: Dict[int, Dict[str, Any]] = {
+                DEFAULT_CUSTOMER.ID: {
+                    "id": DEFAULT_CUSTOMER.ID,
+                    "firstName": DEFAULT_CUSTOMER.FIRST_NAME,
+                    "lastName": DEFAULT_CUSTOMER.LAST_NAME,
+                    "address": {"street": "1431 Main St", "city": "Beverly Hills",
+                                "state": "CA", "zipCode": "90210"},
+                    "phoneNumber": "310-447-4121",
+                    "ssn": "622-11-9999",
+                }
+            }
+            self.credentials = {(DEFAULT_CREDENTIALS.USERNAME, DEFAULT_CREDENTIALS.PASSWORD): DEFAULT_CUSTOMER.ID}
+            self.accounts: Dict[int, Dict[str, Any]] = {}
+            self.transactions: Dict[int, List[Dict[str, Any]]] = {}
+            self.positions: Dict[int, Dict[str, Any]] = {}
+            self.next_position_id = 1
+            self.next_account_id = ACCOUNT_DATA.DEFAULT_ID
+            self.next_transaction_id = 1
+            for account_id in (ACCOUNT_DATA.DEFAULT_ID, ACCOUNT_DATA.SECONDARY_ID):
+                self._open(account_id, DEFAULT_CUSTOMER.ID, "CHECKING", SEED_BALANCE)
+            self.next_account_id = max(self.accounts) + 1
+
+    def clean(self) -> None:
+        with self.lock:
+            self.customers, self.credentials = {}, {}
+            self.accounts, self.transactions = {}, {}
+            self.positions = {}
+
+    # Callers hold self.lock for everything below
+
+    def _open(self, account_id: int, customer_id: int, account_type: str, balance: float) -> Dict[str, Any]:
+        account = {"id": account_id, "customerId": customer_id, "type": account_type, "balance": round(balance, 2)}
+        self.accounts[account_id] = account
+        self.transactions[account_id] = []
+        return account
+
+    def _post(self, account_id: int, kind: str, amount: float, description: str) -> None:
+        account = self.accounts[account_id]
+        balance = account["balance"]
+        transaction_id = self.next_transaction_id
+        if not self.atomic:
+            time.sleep(0.001)  # let concurrent requests interleave
+        account["balance"] = round(balance + (amount if kind == "Credit" else -amount), 2)
+        self.transactions[account_id].append({
+            "id": transaction_id,
+            "accountId": account_id,
+            "type": kind,
+            "date": int(time.time() * 1000),
+            "amount": amount,
+            "description": description,
+        })
+        self.next_transaction_id = transaction_id + 1
+
+    def _positions_of(self, customer_id: int) -> List[Dict[str, Any]]:
+        return [dict(p) for p in self.positions.values() if p["customerId"] == customer_id]
+
+
+class ParabankHandler(BaseHTTPRequestHandler):
+    """Routes requests to the shared Bank on the server."""
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, delayed ACKs add ~40ms per response
+    disable_nagle_algorithm = True
+
+    ROUTES: List[Tuple[str, "re.Pattern[str]", str]] = [
+        ("POST", re.compile(r"^/initializeDB$"), "initialize_db"),
+        ("POST", re.compile(r"^/cleanDB$"), "clean_db"),
+        ("GET", re.compile(r"^/login/(?P<username>[^/]+)/(?P<password>[^/]+)$"), "login"),
+        ("GET", re.compile(r"^/customers/(?P<customer_id>\d+)$"), "get_customer"),
+        ("GET", re.compile(r"^/customers/(?P<customer_id>\d+)/accounts$"), "get_customer_accounts"),
+        ("GET", re.compile(r"^/accounts/(?P<account_id>\d+)$"), "get_account"),
+        ("GET", re.compile(r"^/accounts/(?P<account_id>\d+)/transactions$"), "get_transactions"),
+        ("GET", re.compile(r"^/accounts/(?P<account_id>\d+)/transactions/fromDate/(?P<from_date>[^/]+)"
+                           r"/toDate/(?P<to_date>[^/]+)$"), "get_transactions"),
+        ("POST", re.compile(r"^/transfer$"), "transfer"),
+        ("POST", re.compile(r"^/withdraw$"), "withdraw"),
+        ("POST", re.compile(r"^/deposit$"), "deposit"),
+        ("POST", re.compile(r"^/createAccount$"), "create_account"),
+        ("POST", re.compile(r"^/requestLoan$"), "request_loan"),
+        ("GET", re.compile(r"^/customers/(?P<customer_id>\d+)/positions$"), "get_positions"),
+        ("GET", re.compile(r"^/positions/(?P<position_id>\d+)$"), "get_position"),
+        ("GET", re.compile(r"^/positions/(?P<position_id>\d+)/(?P<start_date>[^/]+)/(?P<end_date>[^/]+)$"),
+         "get_position_history"),
+        ("POST", re.compile(r"^/customers/(?P<customer_id>\d+)/buyPosition$"), "buy_position"),
+        ("POST", re.compile(r"^/customers/(?P<customer_id>\d+)/sellPosition$"), "sell_position"),
+    ]
+
+    # -- plumbing ---------------------------------------------------------
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    @property
+    def bank(self) -> Bank:
+        return self.server.bank
+
+    def _dispatch(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+
+        parts = urlsplit(self.path)
+        path = parts.path[len(self.server.prefix):] if parts.path.startswith(self.server.prefix) else parts.path
+        params = dict(parse_qsl(parts.query))
+        for route_method, pattern, handler in self.ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                try:
+                    status, body = getattr(self, handler)(params=params, **match.groupdict())
+                except (KeyError, ValueError) as exc:
+                    status, body = 400, f"Invalid request: {exc}"
+                return self._send(status, body)
+        self._send(404, f"No route for {method} {path}")
+
+    def _send(self, status: int, body: Any) -> None:
+        if body is None:
+            payload, content_type = b"", "text/plain"
+        elif isinstance(body, str):
+            payload, content_type = body.encode("utf-8"), "text/plain"
+        else:
+            payload, content_type = json.dumps(body).encode("utf-8"), "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _account(self, account_id: Any) -> Dict[str, Any]:
+        account = self.bank.accounts.get(int(account_id))
+        if account is None:
+            raise KeyError(f"Could not find account #{account_id}")
+        return account
+
+    # -- handlers ---------------------------------------------------------
+
+    def initialize_db(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        self.bank.initialize()
+        return 204, None
+
+    def clean_db(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        self.bank.clean()
+        return 204, None
+
+    def login(self, params: Dict[str, str], username: str, password: str) -> Tuple[int, Any]:
+        with self.bank.lock:
+            customer_id = self.bank.credentials.get((username, password))
+            if customer_id is None:
+                return 400, "Invalid username and/or password"
+            return 200, dict(self.bank.customers[customer_id])
+
+    def get_customer(self, params: Dict[str, str], customer_id: str) -> Tuple[int, Any]:
+        with self.bank.lock:
+            customer = self.bank.customers.get(int(customer_id))
+        if customer is None:
+            return 400, f"Could not find customer #{customer_id}"
+        return 200, dict(customer)
+
+    def get_customer_accounts(self, params: Dict[str, str], customer_id: str) -> Tuple[int, Any]:
+        with self.bank.lock:
+            return 200, [dict(a) for a in self.bank.accounts.values() if a["customerId"] == int(customer_id)]
+
+    def get_account(self, params: Dict[str, str], account_id: str) -> Tuple[int, Any]:
+        with self.bank.lock:
+            return 200, dict(self._account(account_id))
+
+    def get_transactions(self, params: Dict[str, str], account_id: str,
+                         from_date: Optional[str] = None, to_date: Optional[str] = None) -> Tuple[int, Any]:
+        with self.bank.lock:
+            self._account(account_id)
+            transactions = [dict(tx) for tx in self.bank.transactions[int(account_id)]]
+        if from_date and to_date:
+            start = datetime.strptime(from_date, DATE_FORMAT).timestamp() * 1000
+            # toDate is inclusive of the whole day
+            end = datetime.strptime(to_date, DATE_FORMAT).timestamp() * 1000 + 86_400_000
+            transactions = [tx for tx in transactions if start <= tx["date"] < end]
+        return 200, transactions
+
+    def transfer(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        from_id, to_id = int(params["fromAccountId"]), int(params["toAccountId"])
+        amount = float(params["amount"])
+        with self.bank.lock:
+            self._account(from_id), self._account(to_id)
+            self.bank._post(from_id, "Debit", amount, "Funds Transfer Sent")
+            self.bank._post(to_id, "Credit", amount, "Funds Transfer Received")
+        return 200, f"Successfully transferred ${amount} from account #{from_id} to account #{to_id}"
+
+    def withdraw(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        account_id, amount = int(params["accountId"]), float(params["amount"])
+        with self.bank.lock:
+            self._account(account_id)
+            self.bank._post(account_id, "Debit", amount, "Withdrawal")
+        return 200, f"Successfully withdrew ${amount} from account #{account_id}"
+
+    def deposit(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        account_id, amount = int(params["accountId"]), float(params["amount"])
+        with self.bank.lock:
+            self._account(account_id)
+            self.bank._post(account_id, "Credit", amount, "Deposit")
+        return 200, f"Successfully deposited ${amount} to account #{account_id}"
+
+    def create_account(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        customer_id, from_id = int(params["customerId"]), int(params["fromAccountId"])
+        account_type = ACCOUNT_TYPES[int(params["newAccountType"])]
+        with self.bank.lock:
+            if customer_id not in self.bank.customers:
+                return 400, f"Could not find customer #{customer_id}"
+            self._account(from_id)
+            account = self.bank._open(self.bank.next_account_id, customer_id, account_type, 0.0)
+            self.bank.next_account_id += 1
+            self.bank._post(from_id, "Debit", NEW_ACCOUNT_DEPOSIT, "Funds Transfer Sent")
+            self.bank._post(account["id"], "Credit", NEW_ACCOUNT_DEPOSIT, "Funds Transfer Received")
+            return 200, dict(account)
+
+    def request_loan(self, params: Dict[str, str]) -> Tuple[int, Any]:
+        customer_id, from_id = int(params["customerId"]), int(params["fromAccountId"])
+        amount, down_payment = float(params["amount"]), float(params["downPayment"])
+        with self.bank.lock:
+            if customer_id not in self.bank.customers:
+                return 400, f"Could not find customer #{customer_id}"
+            source = self._account(from_id)
+            approved = down_payment <= source["balance"]
+            response = {
+                "responseDate": int(time.time() * 1000),
+                "loanProviderName": "Stand-in Bank",
+                "approved": approved,
+                "message": "loan.approved" if approved else "error.insufficient.funds.for.down.payment",
+            }
+            if approved:
+                loan = self.bank._open(self.bank.next_account_id, customer_id, "LOAN", amount)
+                self.bank.next_account_id += 1
+                self.bank._post(from_id, "Debit", down_payment, "Down Payment for Loan")
+                response["accountId"] = loan["id"]
+            return 200, response
+
+    def get_positions(self, params: Dict[str, str], customer_id: str) -> Tuple[int, Any]:
+        with self.bank.lock:
+            if int(customer_id) not in self.bank.customers:
+                return 400, f"Could not find customer #{customer_id}"
+            return 200, self.bank._positions_of(int(customer_id))
+
+    def get_position(self, params: Dict[str, str], position_id: str) -> Tuple[int, Any]:
+        with self.bank.lock:
+            position = self.bank.positions.get(int(position_id))
+        if position is None:
+            return 400, f"Could not find position #{position_id}"
+        return 200, dict(position)
+
+    def get_position_history(self, params: Dict[str, str], position_id: str, start_date: str,
+                             end_date: str) -> Tuple[int, Any]:
+        import numpy as np
+
+        with self.bank.lock:
+            position = self.bank.positions.get(int(position_id))
+        if position is None:
+            return 400, f"Could not find position #{position_id}"
+        start = datetime.strptime(start_date, DATE_FORMAT).date().toordinal()
+        end = datetime.strptime(end_date, DATE_FORMAT).date().toordinal()
+        days, prices = price_series(position["symbol"])
+        window = slice(np.searchsorted(days, start), np.searchsorted(days, end, side="right"))
+        # Dates as epoch milliseconds (UTC midnight), like the other date fields
+        millis = (days[window] - EPOCH_ORDINAL) * 86_400_000
+        return 200, [{"symbol": position["symbol"], "date": int(ms), "closingPrice": float(price)}
+                     for ms, price in zip(millis, prices[window])]
+
+    def buy_position(self, params: Dict[str, str], customer_id: str) -> Tuple[int, Any]:
+        customer_id, account_id = int(customer_id), int(params["accountId"])
+        shares, price = int(params["shares"]), float(params["pricePerShare"])
+        if shares <= 0 or price <= 0:
+            return 400, "Shares and price per share must be positive"
+        with self.bank.lock:
+            if customer_id not in self.bank.customers:
+                return 400, f"Could not find customer #{customer_id}"
+            self._account(account_id)
+            # Like /withdraw, no funds check: the demo backend allows overdrafts
+            cost = round(shares * price, 2)
+            position_id = self.bank.next_position_id
+            self.bank.next_position_id += 1
+            self.bank.positions[position_id] = {
+                "positionId": position_id,
+                "customerId": customer_id,
+                "name": params["name"],
+                "symbol": params["symbol"],
+                "shares": shares,
+                "purchasePrice": price,
+            }
+            self.bank._post(account_id, "Debit", cost, f"Buy {shares} shares of {params['symbol']}")
+            return 200, self.bank._positions_of(customer_id)
+
+    def sell_position(self, params: Dict[str, str], customer_id: str) -> Tuple[int, Any]:
+        customer_id, account_id = int(customer_id), int(params["accountId"])
+        position_id, shares = int(params["positionId"]), int(params["shares"])
+        price = float(params["pricePerShare"])
+        with self.bank.lock:
+            position = self.bank.positions.get(position_id)
+            if position is None or position["customerId"] != customer_id:
+                return 400, f"Could not find position #{position_id} for customer #{customer_id}"
+            self._account(account_id)
+            if shares <= 0 or shares > position["shares"]:
+                return 400, f"Cannot sell {shares} of {position['shares']} shares"
+            position["shares"] -= shares
+            if not position["shares"]:
+                del self.bank.positions[position_id]
+            self.bank._post(account_id, "Credit", round(shares * price, 2),
+                            f"Sell {shares} shares of {position['symbol']}")
+            return 200, self.bank._positions_of(customer_id)
+
+
+class StandInServer:
+    """Runs the stand-in on a background thread; port 0 picks a free port."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0,
+                 prefix: str = "", handler: type = ParabankHandler, atomic: bool = True):
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.httpd.bank = Bank(atomic)
+        self.httpd.latency_ms = latency_ms
+        self.httpd.prefix = prefix
+        self.prefix = prefix
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def bank(self) -> Bank:
+        return self.httpd.bank
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{self.prefix}"
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="stand-in", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def spawn(*args: str) -> Tuple[subprocess.Popen, str]:
+    """
+    Start the stand-in in its own process (so its memory and threads stay out
+    of the caller's measurements); returns the process and its base URL.
+    """
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "tools.stand_in", "--port", "0", *args],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        stdout=subprocess.PIPE, text=True,
+    )
+    return proc, proc.stdout.readline().strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local in-memory Parabank stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080, help="0 picks a free port")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every response")
+    parser.add_argument("--unsafe", action="store_true", help="Non-atomic balance updates (injects lost updates)")
+    args = parser.parse_args()
+
+    server = StandInServer(args.host, args.port, args.latency_ms, atomic=not args.unsafe)
+    # The first line is machine-readable so other tools can start us as a subprocess
+    print(server.base_url, flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()